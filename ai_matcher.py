@@ -1,11 +1,45 @@
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+import os
 import re
-import streamlit as st
+from functools import lru_cache
+
+from ats_engine import section_outline
+from doc_tokens import as_doc
+from embedding_store import EmbeddingStore, text_digest
+from skill_taxonomy import get_taxonomy
+from stage_metrics import span
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# torch | onnx | onnx-int8 (the ONNX backends never import torch)
+BACKEND = os.environ.get("ATS_MODEL_BACKEND", "torch")
+BACKENDS = ("torch", "onnx", "onnx-int8")
 
 # ================= SAFE MODEL LOADING =================
-@st.cache_resource(show_spinner=False)
-def load_model():
-    return SentenceTransformer("all-MiniLM-L6-v2")
+# one model / store per process (no Streamlit dependency)
+@lru_cache(maxsize=None)
+def load_model(backend=None):
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown model backend: {backend}")
+
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(MODEL_NAME)
+
+    from onnx_encoder import ONNX_FILES, OnnxEncoder
+    return OnnxEncoder(MODEL_NAME, os.environ.get("ATS_ONNX_FILE") or ONNX_FILES[backend])
+
+def store_key(backend=None):
+    """
+    Embedding-store model key; each backend's vectors are kept apart.
+    """
+    backend = backend or BACKEND
+    return MODEL_NAME if backend == "torch" else f"{MODEL_NAME}@{backend}"
+
+@lru_cache(maxsize=None)
+def get_embedding_store():
+    return EmbeddingStore()
 
 # =====================================================
 
@@ -14,42 +48,168 @@ def clean_text(text):
 
 def extract_skills_from_jd(jd_text):
     """
-    Dynamically extracts skill-like terms from JD
+    Dynamically extracts skill-like terms from JD (shared skill taxonomy)
     """
-    skill_patterns = [
-        "python", "java", "sql", "machine learning", "data science",
-        "deep learning", "nlp", "pandas", "numpy", "scikit-learn",
-        "power bi", "excel", "statistics", "tensorflow", "pytorch",
-        "flask", "django"
-    ]
+    taxonomy = get_taxonomy()
+    found = taxonomy.matcher.find_doc(as_doc(jd_text))
+    return [skill for skill in taxonomy.skills if skill in found]
 
-    jd_text = jd_text.lower()
-    return [skill for skill in skill_patterns if skill in jd_text]
+def encode_texts(texts, batch_size=32, use_store=True, backend=None):
+    """
+    Unit-length embeddings (N x dim float32) for many texts in batches.
+    Texts seen before (same clean_text output) come from the embedding store.
+    """
+    cleaned = [clean_text(t) for t in texts]
+    if not cleaned:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    store = get_embedding_store() if use_store else None
+    digests = [text_digest(t) for t in cleaned]
+    key = store_key(backend)
+    with span("embedding_store"):
+        known = store.get_many(key, digests) if store else {}
+
+    todo = list(dict.fromkeys(d for d in digests if d not in known))
+    if todo:
+        model = load_model(backend)   # ✅ cached, no re-download
+        index_of = {d: i for i, d in enumerate(digests)}
+        with span("encode"):
+            fresh = model.encode(
+                [cleaned[index_of[d]] for d in todo],
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+        if store:
+            with span("embedding_store"):
+                store.put_many(key, todo, fresh)
+        known.update(zip(todo, fresh))
+
+    return np.stack([known[d] for d in digests]).astype(np.float32, copy=False)
+
+def jd_embedding(jd):
+    """
+    JD text or a JobProfile -> unit vector; a profile compiled with the
+    current backend brings its own.
+    """
+    vector = getattr(jd, "embedding", None)
+    if vector is not None and jd.embedding_model == store_key():
+        return vector
+    return encode_texts([getattr(jd, "text", jd)])[0]
+
+def semantic_match_scores(resume_texts, jd_text, batch_size=32):
+    """
+    AI semantic similarity scores (0–100) of many resumes against one JD.
+    The JD is encoded once; cosine scores are one matrix-vector product.
+    """
+    resume_texts = list(resume_texts)
+    if not resume_texts:
+        return np.zeros(0, dtype=np.float32)
+
+    jd_emb = jd_embedding(jd_text)
+    resume_embs = encode_texts(resume_texts, batch_size)
+
+    return np.round(resume_embs @ jd_emb * 100, 2)
 
 def semantic_match_score(resume_text, jd_text):
     """
     AI semantic similarity score (0–100)
     """
-    model = load_model()   # ✅ cached, no re-download
+    return round(float(semantic_match_scores([resume_text], jd_text)[0]), 2)
+
+# ================= CHUNKED (SECTION-AWARE) SCORING =================
+# MiniLM truncates at 256 word pieces, so long resumes are split along
+# their sections into windows that fit, and chunk scores are aggregated
 
-    resume_emb = model.encode(
-        clean_text(resume_text),
-        convert_to_tensor=True
-    )
-    jd_emb = model.encode(
-        clean_text(jd_text),
-        convert_to_tensor=True
-    )
+CHUNK_WORDS = 180   # ~256 word pieces
+
+SECTION_WEIGHTS = {
+    "TECHNICAL SKILLS": 1.5, "CORE SKILLS": 1.5, "SKILLS": 1.5,
+    "WORK EXPERIENCE": 1.3, "PROFESSIONAL EXPERIENCE": 1.3, "EXPERIENCE": 1.3,
+    "PROJECTS": 1.2, "ACADEMIC PROJECTS": 1.2, "PERSONAL PROJECTS": 1.2,
+    "PROJECT EXPERIENCE": 1.2,
+    "INTERNSHIP EXPERIENCE": 1.1, "INTERNSHIPS": 1.1, "INTERNSHIP": 1.1,
+    "EDUCATION": 0.6, "CERTIFICATIONS": 0.8,
+    "HOBBIES": 0.2, "DECLARATION": 0.1, "LANGUAGES": 0.3,
+}
+
+def chunk_resume(text, max_words=CHUNK_WORDS):
+    """
+    [(section, chunk_text)] covering the whole resume; text before the
+    first header is section "HEADER".
+    """
+    outline = section_outline(text)
+    parts = [("HEADER", text[:outline[0][1]] if outline else text)]
+    parts += [(name, text[start:end]) for name, _, start, end in outline]
+
+    chunks = []
+    for section, body in parts:
+        words = body.split()
+        for i in range(0, len(words), max_words):
+            chunks.append((section, " ".join(words[i:i + max_words])))
+    return chunks
+
+def semantic_match_scores_chunked(resume_texts, jd_text, aggregate="weighted",
+                                  batch_size=32, max_words=CHUNK_WORDS):
+    """
+    Chunked similarity scores (0–100) of many resumes against one JD.
+    All chunks of all resumes are encoded together in batches.
 
-    similarity = util.cos_sim(resume_emb, jd_emb).item()
-    return round(similarity * 100, 2)
+    aggregate: "max" (best chunk), "mean" (all chunks) or "weighted"
+    (best chunk per section, averaged with SECTION_WEIGHTS).
+    """
+    if aggregate not in ("max", "mean", "weighted"):
+        raise ValueError(f"unknown aggregate: {aggregate}")
+
+    resume_texts = list(resume_texts)
+    owners, sections, chunks = [], [], []
+    for i, text in enumerate(resume_texts):
+        for section, chunk in chunk_resume(text, max_words):
+            owners.append(i)
+            sections.append(section)
+            chunks.append(chunk)
+
+    scores = np.zeros(len(resume_texts), dtype=np.float32)
+    if not chunks:
+        return scores
+
+    jd_emb = jd_embedding(jd_text)
+    sims = encode_texts(chunks, batch_size) @ jd_emb
+
+    owners = np.asarray(owners)
+    present, starts = np.unique(owners, return_index=True)   # owners are sorted
+
+    if aggregate == "max":
+        scores[present] = np.maximum.reduceat(sims, starts)
+    elif aggregate == "mean":
+        scores[present] = np.add.reduceat(sims, starts) / np.diff(np.append(starts, len(sims)))
+    else:
+        best = {}
+        for owner, section, sim in zip(owners.tolist(), sections, sims.tolist()):
+            key = (owner, section)
+            best[key] = max(best.get(key, sim), sim)
+        totals = {}
+        for (owner, section), sim in best.items():
+            weight = SECTION_WEIGHTS.get(section, 1.0)
+            total, weights = totals.get(owner, (0.0, 0.0))
+            totals[owner] = (total + weight * sim, weights + weight)
+        for owner, (total, weights) in totals.items():
+            scores[owner] = total / weights if weights else 0.0
+
+    return np.round(scores * 100, 2)
+
+def semantic_match_score_chunked(resume_text, jd_text, aggregate="weighted"):
+    """
+    Section-aware AI similarity score (0–100) for one (possibly long) resume
+    """
+    return round(float(semantic_match_scores_chunked([resume_text], jd_text, aggregate)[0]), 2)
 
 def skill_gap_analysis(resume_text, jd_text):
     required_skills = extract_skills_from_jd(jd_text)
-    resume_text = resume_text.lower()
+    resume_skills = get_taxonomy().matcher.find(resume_text.lower())
 
-    matched = [s for s in required_skills if s in resume_text]
-    missing = [s for s in required_skills if s not in resume_text]
+    matched = [s for s in required_skills if s in resume_skills]
+    missing = [s for s in required_skills if s not in resume_skills]
 
     return matched, missing
 
@@ -76,21 +236,14 @@ def ai_explanation(score, matched, missing):
     }
 
 def learning_recommendations(missing_skills):
-    roadmap = {
-        "machine learning": ("Supervised → Unsupervised → Projects", "4–6 weeks"),
-        "data science": ("EDA → Statistics → ML", "5–6 weeks"),
-        "nlp": ("Text cleaning → TF-IDF → Transformers", "4 weeks"),
-        "statistics": ("Probability → Inferential stats", "2–3 weeks"),
-        "power bi": ("DAX → Dashboards → Reports", "2–3 weeks"),
-        "python": ("Core → Pandas → Projects", "3–4 weeks"),
-    }
+    roadmap = get_taxonomy().roadmap
 
     recs = {}
     for skill in missing_skills:
         if skill in roadmap:
             recs[skill] = {
-                "path": roadmap[skill][0],
-                "time": roadmap[skill][1]
+                "path": roadmap[skill]["path"],
+                "time": roadmap[skill]["time"]
             }
 
     return recs
@@ -0,0 +1,1080 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+
+from doc_tokens import TokenizedDoc, as_doc
+from skill_matcher import trie_pattern
+from skill_taxonomy import get_taxonomy
+from stage_metrics import timed
+
+# --------------------------------------------------
+# ATS ANALYSIS ENGINE (UI-FREE)
+# Shared by the Streamlit app and the batch screener.
+# --------------------------------------------------
+
+# bump whenever clean_resume_text output changes (invalidates text caches)
+CLEAN_VERSION = 1
+# bump whenever any scorer's output changes (invalidates memoized analyses)
+ENGINE_VERSION = 1
+# ats_score weighting: "overlap" (plain word overlap), "tfidf" or "bm25"
+# (corpus IDF table, see term_weights.py)
+SCORE_MODES = ("overlap", "tfidf", "bm25")
+SCORE_MODE = os.environ.get("ATS_SCORE_MODE", "overlap")
+if SCORE_MODE not in SCORE_MODES:
+    raise ValueError(f"ATS_SCORE_MODE must be one of {', '.join(SCORE_MODES)}, not {SCORE_MODE!r}")
+
+# --------------------------------------------------
+# CLEAN + NORMALIZE TEXT  (FINAL STABLE VERSION)
+# --------------------------------------------------
+
+# order matters: earlier headers win where headers overlap
+RESUME_HEADERS = [
+    "PROFESSIONAL SUMMARY",
+    "SUMMARY",
+    "EDUCATION",
+    "INTERNSHIP EXPERIENCE",
+    "INTERNSHIP",
+    "PROJECTS",
+    "PROJECT EXPERIENCE",
+    "ACADEMIC PROJECTS",
+    "PERSONAL PROJECTS",
+    "TECHNICAL SKILLS",
+    "SKILLS",
+    "CERTIFICATIONS"
+]
+
+# case-sensitive scan over case-folded text (much faster than IGNORECASE);
+# the greedy tree always yields the longest header at a position
+_HEADER_SCAN = re.compile(trie_pattern([h.lower() for h in RESUME_HEADERS]))
+_HEADER_RANK = {h: i for i, h in enumerate(RESUME_HEADERS)}
+# shorter headers matching at the same start are prefixes of the longest one
+_HEADER_PREFIXES = {
+    h: [p for p in RESUME_HEADERS if h.startswith(p)]
+    for h in RESUME_HEADERS
+}
+
+# the only non-ASCII characters IGNORECASE treats as ASCII letters
+_FOLD_EXTRA = {"İ": "i", "ı": "i", "ſ": "s", "K": "k"}
+_FOLD_TABLE = str.maketrans({
+    **{chr(c): chr(c + 32) for c in range(ord("A"), ord("Z") + 1)},
+    **_FOLD_EXTRA
+})
+
+def _casefold_same_length(text):
+    folded = text.lower()
+    if len(folded) != len(text):
+        return text.translate(_FOLD_TABLE)
+    if "ı" in folded or "ſ" in folded:
+        return folded.translate(_FOLD_TABLE)
+    return folded
+
+# runs of blanks / bullets; bare " ", "\n" and "\n\n" never change
+_BLANK_SET = " \t\n•●▪"
+_BLANK_RUN = re.compile(
+    rf"(?! (?![{_BLANK_SET}]))(?!\n\n?(?![{_BLANK_SET}]))[{_BLANK_SET}]+"
+)
+
+@lru_cache(maxsize=2048)
+def _normalize_blank_run(run):
+    run = re.sub(r"[•●▪]", "\n• ", run)
+    run = re.sub(r"[ \t]+", " ", run)
+    return re.sub(r"\n{3,}", "\n\n", run)
+
+def _header_breaks(text):
+    """
+    (start, end, header) spans where "\n\n" gets inserted, replaying the
+    old one-re.sub-per-header loop in RESUME_HEADERS order.
+    """
+    folded = _casefold_same_length(text)
+
+    candidates = []
+
+    def add(start, found):
+        for h in _HEADER_PREFIXES[found.upper()]:
+            candidates.append((_HEADER_RANK[h], start, start + len(h), h))
+
+    for m in _HEADER_SCAN.finditer(folded):
+        add(m.start(), m.group())
+        # headers starting inside this one (nested or overlapping)
+        for pos in range(m.start() + 1, m.end()):
+            inner = _HEADER_SCAN.match(folded, pos)
+            if inner:
+                add(pos, inner.group())
+
+    if not candidates:
+        return []
+
+    candidates.sort()
+
+    inserted = []      # sorted insertion points
+    fired = []
+    rank_end = -1
+    last_rank = -1
+
+    for rank, start, end, h in candidates:
+        if rank != last_rank:
+            last_rank, rank_end = rank, -1
+
+        # (?<!\n): original newline, or one an earlier header inserted
+        if start and text[start - 1] == "\n":
+            continue
+        i = bisect_left(inserted, start)
+        if i < len(inserted) and inserted[i] == start:
+            continue
+        # already consumed by a match of the same header
+        if start < rank_end:
+            continue
+        # an earlier header broke this one apart
+        if i < len(inserted) and inserted[i] < end:
+            continue
+
+        inserted.insert(i, start)
+        fired.append((start, end, h))
+        rank_end = end
+
+    fired.sort()
+    return fired
+
+@timed("clean")
+def clean_resume_text(text):
+
+    if not text:
+        return ""
+
+    # normalize line endings
+    text = text.replace("\r", "\n")
+
+    # ---------- FORCE HEADER BREAKS ----------
+    # 🔥 IMPORTANT:
+    # Add newline ONLY if header is attached to sentence
+    fired = _header_breaks(text)
+
+    if fired:
+        out = []
+        pos = 0
+        cur_start, cur_end, cur_h = 0, 0, ""
+
+        for start, end, h in fired:
+            # flush the header currently being rewritten in upper case
+            if pos < cur_end:
+                stop = min(start, cur_end)
+                out.append(cur_h[pos - cur_start:stop - cur_start])
+                pos = stop
+            if pos < start:
+                out.append(text[pos:start])
+                pos = start
+
+            out.append("\n\n")
+
+            if end >= cur_end:
+                cur_start, cur_end, cur_h = start, end, h
+
+        if pos < cur_end:
+            out.append(cur_h[pos - cur_start:])
+            pos = cur_end
+        out.append(text[pos:])
+
+        text = "".join(out)
+
+    # ---------- FIX BULLETS / EXTRA SPACES / MULTIPLE NEWLINES ----------
+    text = _BLANK_RUN.sub(lambda m: _normalize_blank_run(m.group()), text)
+
+    return text.strip()
+
+# --------------------------------------------------
+# ✅ ONE-PASS SECTION SEGMENTER
+# --------------------------------------------------
+
+# every line that is one of these (any case, optional ":") starts a section
+SECTION_HEADERS = [
+    "PROFESSIONAL SUMMARY",
+    "SUMMARY",
+    "CAREER OBJECTIVE",
+    "OBJECTIVE",
+    "EDUCATION",
+    "INTERNSHIP EXPERIENCE",
+    "INTERNSHIPS",
+    "INTERNSHIP",
+    "WORK EXPERIENCE",
+    "PROFESSIONAL EXPERIENCE",
+    "EXPERIENCE",
+    "INDUSTRIAL TRAINING",
+    "TRAINING",
+    "PROJECT EXPERIENCE",
+    "ACADEMIC PROJECTS",
+    "PERSONAL PROJECTS",
+    "PROJECTS",
+    "TECHNICAL SKILLS",
+    "CORE SKILLS",
+    "SKILLS",
+    "CERTIFICATIONS",
+    "ACHIEVEMENTS",
+    "LANGUAGES",
+    "HOBBIES",
+    "DECLARATION"
+]
+
+# multi-word headers may be split across lines:
+# clean_resume_text turns "TECHNICAL SKILLS" into "TECHNICAL \n\nSKILLS"
+def _header_alternation(headers):
+    return "|".join(
+        r"\s+".join(re.escape(w) for w in h.split())
+        for h in sorted(headers, key=len, reverse=True)
+    )
+
+# multi-word headers clean_resume_text never breaks onto their own line
+GLUED_HEADERS = [
+    h for h in SECTION_HEADERS
+    if " " in h and not any(r in h for r in RESUME_HEADERS)
+]
+
+# group 1: a line that is only a header, any case
+# group 2: one of GLUED_HEADERS, upper case, ending a line PDF extraction
+#          glued it onto ("... Python, SQL WORK EXPERIENCE"), unless the
+#          whole line is capitals only (a title, not glued body text)
+_SECTION_LINE = re.compile(
+    r"(?:^[ \t]*(?i:(" + _header_alternation(SECTION_HEADERS) + r"))"
+    r"|^(?![A-Z \t.,&'/|-]*$)[^\n]*?(?<![A-Za-z])(" + _header_alternation(GLUED_HEADERS) + r"))"
+    r"[ \t]*:?[ \t\r]*$",
+    re.MULTILINE
+)
+
+@lru_cache(maxsize=64)
+def section_outline(text):
+    """
+    Every section in document order as (HEADER, header_start, start, end);
+    text[start:end] is the section body.
+    """
+    if not text:
+        return ()
+
+    matches = list(_SECTION_LINE.finditer(text))
+
+    # a glued header starts mid-line: the text before it stays in the
+    # previous section
+    starts = [m.start() if m.group(1) else m.start(2) for m in matches]
+
+    return tuple(
+        (
+            " ".join((m.group(1) or m.group(2)).split()).upper(),
+            starts[i],
+            m.end(),
+            starts[i + 1] if i + 1 < len(matches) else len(text)
+        )
+        for i, m in enumerate(matches)
+    )
+
+@lru_cache(maxsize=64)
+def segment_sections(text):
+    """
+    Walks the text once and returns {HEADER: (start, end)} body spans,
+    first occurrence of each header. Shared (read-only) by every
+    extract_*_section call on the same text.
+    """
+    spans = {}
+    for name, _, start, end in section_outline(text):
+        if name not in spans:
+            spans[name] = (start, end)
+    return spans
+
+def extract_section(text, section_name):
+
+    if not text:
+        return ""
+
+    span = segment_sections(text).get(section_name.upper())
+    if not span:
+        return ""
+
+    start, end = span
+    return text[start:end].strip()
+
+# --------------------------------------------------
+# USER DETAILS
+# --------------------------------------------------
+
+@timed("details")
+def extract_user_details(text):
+    lines = [l.strip() for l in text.splitlines() if l.strip()]
+
+    # ---------------- NAME EXTRACTION ----------------
+    name = "Name not found"
+    blacklist = {
+        "engineer", "developer", "student", "fresher",
+        "software", "email", "phone", "mobile",
+        "linkedin", "github", "resume", "curriculum", "vitae"
+    }
+
+    for line in lines[:10]:
+        words = line.split()
+        if (
+            2 <= len(words) <= 4
+            and not re.search(r"\d|@", line)
+            and not any(b in line.lower() for b in blacklist)
+            and re.fullmatch(r"[A-Za-z.\s]+", line)
+        ):
+            name = line.title()
+            break
+
+    # ---------------- EMAIL ----------------
+    email_match = re.search(
+        r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+        text
+    )
+    email = email_match.group() if email_match else "Email not found"
+
+    # ---------------- PHONE ----------------
+    phone_match = re.search(
+        r"(\+?\d{1,3}[\s\-]?)?\d{10}",
+        text.replace(" ", "")
+    )
+    phone = phone_match.group() if phone_match else "Phone not found"
+
+    # ---------------- LINKS (SAFE EXTRACTION) ----------------
+    linkedin = "LinkedIn not found"
+    github = "GitHub not found"
+    portfolio = "Portfolio not found"
+
+    url_pattern = re.compile(r"https?://[^\s]+")
+
+    blacklist_domains = {
+        "gmail.com", "yahoo.com", "outlook.com",
+        "linkedin.com", "github.com",
+        "facebook.com", "instagram.com", "twitter.com"
+    }
+
+    portfolio_platforms = {
+        "netlify.app", "vercel.app", "github.io",
+        "pages.dev", "web.app", "firebaseapp.com",
+        "render.com", "herokuapp.com"
+    }
+
+    for match in url_pattern.finditer(text):
+        url = match.group().strip(".,)")
+        clean = url.lower()
+
+        if "linkedin.com/in/" in clean:
+            linkedin = url
+
+        elif "github.com/" in clean and not clean.endswith("github.com"):
+            github = url
+
+        elif not any(b in clean for b in blacklist_domains):
+            # Accept hosting platforms or custom domain (example.com)
+            if any(p in clean for p in portfolio_platforms) or clean.count(".") == 1:
+                portfolio = url
+
+    return {
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "linkedin": linkedin,
+        "github": github,
+        "portfolio": portfolio
+    }
+
+# --------------------------------------------------
+# ATS SCORE
+# --------------------------------------------------
+@timed("ats_score")
+def ats_score(resume, jd, mode=None, idf_table=None):
+    """
+    0–98 keyword match. tfidf / bm25 read `idf_table` (term_weights.IdfTable),
+    by default the ATS_IDF_TABLE file.
+    """
+    mode = mode or SCORE_MODE
+    if mode == "overlap":
+        resume_words = as_doc(resume).word_set()
+        jd_words = as_doc(jd).word_set()
+        match_ratio = len(resume_words & jd_words) / max(1, len(jd_words))
+    else:
+        from term_weights import get_idf_table, weighted_match
+        if idf_table is None:
+            idf_table = get_idf_table()
+        match_ratio = weighted_match(resume, jd, idf_table, mode)
+    return round(min(98, 35 + match_ratio * 65))
+
+# --------------------------------------------------
+# REAL ATS SKILL ENGINE
+# --------------------------------------------------
+
+# skills, synonyms and categories live in skill_taxonomy.json
+# (hot-reloaded, see skill_taxonomy.get_taxonomy)
+
+@timed("skill_gap")
+def skill_gap(resume, jd):
+    matcher = get_taxonomy().matcher
+    resume_skills = matcher.find_doc(as_doc(resume))
+    jd_skills = matcher.find_doc(as_doc(jd))
+
+    matched = {s for s in jd_skills if s in resume_skills}
+    missing = {s for s in jd_skills if s not in resume_skills}
+
+    return sorted(matched)[:10], sorted(missing)[:10]
+
+# --------------------------------------------------
+# 🔥 REAL-TIME ANALYSIS HELPERS
+# --------------------------------------------------
+def skill_usage_depth(resume, skills):
+    hits = get_taxonomy().matcher.find_doc(as_doc(resume))
+    depth = {}
+    for s in skills:
+        depth[s] = len(hits.get(s, ()))
+    return depth
+
+def has_metrics(resume):
+    return bool(re.search(r"\b\d+%|\b\d+\s?(accuracy|users|records|increase|reduction)", as_doc(resume).lower))
+
+def jd_phrase_gap(resume, jd):
+    jd_words = as_doc(jd).word_set(5)
+    resume_words = as_doc(resume).word_set(5)
+    return list(jd_words - resume_words)[:5]
+
+# --------------------------------------------------
+# ✅ REAL-TIME SUGGESTION ENGINE
+# --------------------------------------------------
+@timed("suggestions")
+def generate_resume_suggestions(resume, jd, score, matched, missing):
+    suggestions = []
+
+    depth = skill_usage_depth(resume, matched)
+    metrics = has_metrics(resume)
+    jd_missing = jd_phrase_gap(resume, jd)
+
+    for skill, count in depth.items():
+        if count == 1:
+            suggestions.append(
+                f"You mention **{skill}** only once. Recruiters prefer seeing skills reinforced through projects or experience."
+            )
+
+    if missing:
+        suggestions.append(
+            f"The role expects **{missing[0]}**, but it is missing from your resume. "
+            f"Adding even a mini-project or coursework can improve ATS ranking."
+        )
+
+    if jd_missing:
+        suggestions.append(
+            f"Important job description terms like **{', '.join(jd_missing[:3])}** are missing. "
+            f"ATS systems reward resumes that mirror JD language naturally."
+        )
+
+    if not metrics:
+        suggestions.append(
+            "Your resume lacks measurable impact. Add metrics like accuracy %, performance improvement, or user count."
+        )
+
+    if score < 70:
+        suggestions.append(
+            "Rewrite your Professional Summary using exact keywords from the job description to improve ATS match."
+        )
+
+    if not suggestions:
+        suggestions.append(
+            "Your resume aligns well with the job description. Minor wording improvements can further strengthen it."
+        )
+
+    return suggestions[:5]
+
+# --------------------------------------------------
+# 👩‍💼 RECRUITER VIEW ENGINE (NEW FEATURE)
+# --------------------------------------------------
+@timed("recruiter")
+def recruiter_analysis(resume, matched_skills, missing_skills, score):
+
+    strengths = []
+    risks = []
+
+    resume_doc = as_doc(resume)
+    resume_lower = resume_doc.lower
+
+    # ---------- STRENGTHS ----------
+    if len(matched_skills) >= 5:
+        strengths.append("Strong alignment with job technical requirements")
+
+    if "python" in matched_skills:
+        strengths.append("Python development capability detected")
+
+    if any(db in matched_skills for db in ["mysql", "postgresql", "mongodb"]):
+        strengths.append("Database knowledge present")
+
+    if re.search(r"\b\d+%|\b\d+\s?(users|accuracy|increase|reduction)", resume_lower):
+        strengths.append("Quantified achievements improve recruiter confidence")
+
+    if score >= 80:
+        strengths.append("High ATS compatibility")
+
+    # ---------- RISK FLAGS ----------
+    if len(missing_skills) >= 5:
+        risks.append("Multiple required skills missing")
+
+    if "git" in missing_skills:
+        risks.append("Version control experience not visible")
+
+    if not re.search(r"(team|collaborated|communication)", resume_lower):
+        risks.append("Soft skills not clearly demonstrated")
+
+    if score < 65:
+        risks.append("Low ATS alignment may reduce shortlist chances")
+
+    # ---------- HIRING CONFIDENCE ----------
+    confidence = min(
+        95,
+        int(score * 0.7 + len(matched_skills) * 3)
+    )
+
+    return strengths, risks, confidence
+
+# --------------------------------------------------
+# 🤖 AI RECRUITER CONFIDENCE ENGINE
+# --------------------------------------------------
+@timed("confidence")
+def ai_recruiter_confidence(resume, matched, missing, score):
+
+    resume_doc = as_doc(resume)
+    resume_lower = resume_doc.lower
+    confidence = 40
+
+    # skill impact
+    confidence += len(matched) * 4
+    confidence -= len(missing) * 2
+
+    # project depth
+    project_words = [
+        "developed","built","implemented",
+        "designed","trained","created","integrated"
+    ]
+
+    project_strength = sum(resume_lower.count(w) for w in project_words)
+    confidence += min(project_strength * 2, 15)
+
+    # metrics detection
+    if re.search(r"\d+%|\d+\s?(users|accuracy|increase|reduction)", resume_lower):
+        confidence += 10
+
+    # experience signal
+    if re.search(r"(intern|experience|worked|company)", resume_lower):
+        confidence += 8
+
+    # ATS weight
+    confidence += int(score * 0.25)
+
+    # short resume penalty
+    if resume_doc.split_len < 250:
+        confidence -= 8
+
+    confidence = max(25, min(96, confidence))
+    return confidence
+
+
+# --------------------------------------------------
+# 🧠 RECRUITER FINAL DECISION
+# --------------------------------------------------
+def recruiter_decision(confidence):
+
+    if confidence >= 80:
+        return "✅ Strong Hire", "success"
+    elif confidence >= 60:
+        return "⚠️ Consider", "warning"
+    else:
+        return "❌ Reject", "error"
+
+# --------------------------------------------------
+# AI PROFILE SUMMARY
+# --------------------------------------------------
+def generate_ai_profile_summary(details, matched_skills, jd_text):
+    
+    # Extract top important JD keywords
+    jd_keywords = as_doc(jd_text).ordered_words(5)[:6]
+
+    skills = ", ".join(matched_skills[:5]) if matched_skills else "relevant technologies"
+    jd_part = ", ".join(jd_keywords[:4]) if jd_keywords else "modern development practices"
+
+    summary = (
+        f"Motivated and detail-oriented software graduate with hands-on experience in {skills}. "
+        f"Strong understanding of {jd_part}. "
+        f"Proven ability to develop scalable applications and solve real-world problems efficiently. "
+        f"Eager to contribute technical expertise in a dynamic organization while continuously enhancing skills."
+    )
+
+    return summary
+
+
+# --------------------------------------------------
+# EDUCATION (🔥 FIXED PURSUING SUPPORT)
+# --------------------------------------------------
+@timed("sections.education")
+def extract_education_section(text):
+
+    block = extract_section(text, "EDUCATION")
+    if not block:
+        return []
+
+    lines = [l.strip() for l in block.split("\n") if l.strip()]
+
+    entries = []
+    current = None
+
+    for line in lines:
+
+        if re.search(r"(mca|bca|b\.?tech|bachelor|master|degree)", line, re.IGNORECASE):
+
+            if current:
+                entries.append(current)
+
+            year_match = re.search(r"(20\d{2}\s*[-–]\s*(20\d{2}|Present))", line)
+
+            pursuing = " (Pursuing)" if "present" in line.lower() or "pursuing" in line.lower() else ""
+
+            current = {
+                "degree": re.sub(r"\(.*?\)", "", line).strip(),
+                "year": year_match.group(0) if year_match else "",
+                "institution": "",
+                "cgpa": "",
+                "pursuing": pursuing
+            }
+
+        elif re.search(r"(college|university|school|institute)", line, re.IGNORECASE):
+            if current:
+                current["institution"] = line
+
+        elif "cgpa" in line.lower():
+            if current:
+                current["cgpa"] = line
+
+    if current:
+        entries.append(current)
+
+    return entries
+
+# --------------------------------------------------
+# INTERNSHIP EXTRACTION (ATS UNIVERSAL VERSION)
+# --------------------------------------------------
+@timed("sections.internship")
+def extract_internship_section(text):
+
+    if not text:
+        return []
+
+    section_names = [
+        "INTERNSHIP EXPERIENCE",
+        "INTERNSHIPS",
+        "INTERNSHIP",
+        "EXPERIENCE",
+        "WORK EXPERIENCE"
+    ]
+
+    block = ""
+    for name in section_names:
+        block = extract_section(text, name)
+        if block:
+            break
+
+    if not block:
+        return []
+
+    lines = [l.strip() for l in block.split("\n") if l.strip()]
+
+    internships = []
+    current = None
+    description = []
+
+    STOP_HEADERS = (
+        "project",
+        "education",
+        "skill",
+        "technical",
+        "certification",
+        "summary"
+    )
+
+    for line in lines:
+
+        lower = line.lower()
+
+        # ✅ STOP safely when next section begins
+        if any(lower.startswith(h) for h in STOP_HEADERS):
+            break
+
+        # ---- DURATION ----
+        duration_match = re.search(
+            r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s*\d{4}.*?(present|\d{4})?",
+            lower
+        )
+
+        if duration_match and current:
+            current["duration"] = line
+            continue
+
+        # ---- BULLETS ----
+        if line.startswith(("•", "-", "–")):
+            if current:
+                description.append(line.lstrip("•-– ").strip())
+            continue
+
+        # ---- NEW TITLE ----
+        if len(line.split()) <= 12:
+
+            if current:
+                current["description"] = " ".join(description)
+                internships.append(current)
+
+            current = {
+                "title": line,
+                "duration": "",
+                "description": ""
+            }
+            description = []
+            continue
+
+        # ---- DESCRIPTION ----
+        if current:
+            description.append(line)
+
+    if current:
+        current["description"] = " ".join(description)
+        internships.append(current)
+
+    return internships
+
+# --------------------------------------------------
+# ✅ UNIVERSAL EXPERIENCE EXTRACTOR (ATS STYLE)
+# --------------------------------------------------
+@timed("sections.experience")
+def extract_experience_section(text):
+
+    if not text:
+        return []
+
+    experience_headers = [
+        "EXPERIENCE",
+        "WORK EXPERIENCE",
+        "PROFESSIONAL EXPERIENCE",
+        "TRAINING",
+        "INDUSTRIAL TRAINING"
+    ]
+
+    # earliest experience-like section in the resume
+    sections = segment_sections(text)
+    found = [sections[h] for h in experience_headers if h in sections]
+
+    if not found:
+        return []
+
+    start, end = min(found)
+    block = text[start:end]
+
+    lines = [l.strip() for l in block.split("\n") if l.strip()]
+
+    experiences = []
+    current = None
+    description = []
+
+    for line in lines:
+
+        # NEW ENTRY (company/title line)
+        if len(line.split()) <= 12 and not line.startswith(("•", "-", "–")):
+
+            if current:
+                current["description"] = " ".join(description)
+                experiences.append(current)
+
+            current = {
+                "title": line,
+                "duration": "",
+                "description": ""
+            }
+            description = []
+            continue
+
+        # duration detection
+        if re.search(r"(20\d{2}|present|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)",
+                     line.lower()):
+            if current and not current["duration"]:
+                current["duration"] = line
+                continue
+
+        # description
+        clean = line.lstrip("•-– ").strip()
+        description.append(clean)
+
+    if current:
+        current["description"] = " ".join(description)
+        experiences.append(current)
+
+    return experiences
+
+# --------------------------------------------------
+# PROJECTS (🔥 FIXED)
+# --------------------------------------------------
+@timed("sections.projects")
+def extract_project_section(text):
+
+    if not text:
+        return []
+
+    block = extract_section(text, "PROJECTS")
+
+    if not block:
+        block = extract_section(text, "ACADEMIC PROJECTS")
+
+    if not block:
+        return []
+
+    lines = [l.strip() for l in block.split("\n") if l.strip()]
+
+    projects = []
+    current = None
+    description = []
+
+    # verbs normally used in descriptions
+    description_verbs = (
+        "developed", "created", "implemented",
+        "designed", "built", "used", "applied",
+        "integrated", "trained", "analyzed"
+    )
+
+    STOP_HEADERS = (
+        "technical",
+        "technical skills",
+        "skills",
+        "education",
+        "certifications",
+        "internship",
+        "experience"
+    )
+
+    for line in lines:
+
+        clean = line.strip()
+        lower = clean.lower()
+
+        # ✅ STOP when next section starts
+        if any(lower.startswith(h) for h in STOP_HEADERS):
+            break
+
+        # ✅ TECHNOLOGY LINE
+        if "technolog" in lower:
+            if current:
+                current["technologies"] = clean
+            continue
+
+        # ✅ BULLET DESCRIPTION
+        if clean.startswith(("•", "-", "–")):
+            if current:
+                description.append(clean.lstrip("•-– ").strip())
+            continue
+
+        # ✅ TITLE DETECTION (SMART)
+        is_title = (
+            not lower.startswith(description_verbs)   # NOT sentence
+            and len(clean.split()) <= 12              # short
+        )
+
+        if is_title:
+            if current:
+                current["description"] = " ".join(description)
+                projects.append(current)
+
+            current = {
+                "title": clean,
+                "description": "",
+                "technologies": ""
+            }
+            description = []
+            continue
+
+        # ✅ NORMAL DESCRIPTION
+        if current:
+            description.append(clean)
+
+    if current:
+        current["description"] = " ".join(description)
+        projects.append(current)
+
+    return projects
+
+# --------------------------------------------------
+# ✅ EXPERIENCE VALIDATOR (REAL ATS LOGIC)
+# --------------------------------------------------
+def is_real_experience(exp):
+
+    text = (
+        exp.get("title","") + " " +
+        exp.get("duration","") + " " +
+        exp.get("description","")
+    ).lower()
+
+    # must contain date or duration
+    has_date = bool(re.search(
+        r"(20\d{2}|present|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)",
+        text
+    ))
+
+    # must look like company/role
+    role_keywords = [
+        "engineer","developer","analyst","consultant",
+        "company","solutions","technologies","pvt","ltd"
+    ]
+
+    has_role = any(word in text for word in role_keywords)
+
+    # must contain work action verbs
+    work_words = [
+        "developed","built","designed","implemented",
+        "worked","created","maintained","handled"
+    ]
+
+    has_work = any(word in text for word in work_words)
+
+    return has_date and has_role and has_work
+
+
+# --------------------------------------------------
+# ✅ CHECK IF CANDIDATE IS EXPERIENCED
+# --------------------------------------------------
+def is_candidate_experienced(experience_list):
+
+    real_exp = [
+        exp for exp in experience_list
+        if is_real_experience(exp)
+    ]
+
+    return len(real_exp) > 0
+
+# --------------------------------------------------
+# ANALYSIS ENTRY POINT
+# --------------------------------------------------
+@dataclass(frozen=True)
+class AnalysisResult:
+    details: dict
+    score: int
+    matched: list
+    missing: list
+    strengths: list
+    risks: list
+    confidence: int
+    decision: str
+    decision_type: str
+    suggestions: list
+
+    def to_dict(self):
+        return asdict(self)
+
+@timed("analyze")
+def analyze(resume_text, jd_text):
+    """
+    Full analysis of one cleaned resume against one JD (everything the
+    app shows except the optimized PDF).
+    """
+    resume_doc = as_doc(resume_text)
+    jd_doc = as_doc(jd_text)
+    resume = resume_doc.text
+
+    score = ats_score(resume_doc, jd_doc)
+    matched, missing = skill_gap(resume_doc, jd_doc)
+    strengths, risks, _ = recruiter_analysis(resume_doc, matched, missing, score)
+    confidence = ai_recruiter_confidence(resume_doc, matched, missing, score)
+    decision, decision_type = recruiter_decision(confidence)
+
+    return AnalysisResult(
+        details=extract_user_details(resume),
+        score=score,
+        matched=matched,
+        missing=missing,
+        strengths=strengths,
+        risks=risks,
+        confidence=confidence,
+        decision=decision,
+        decision_type=decision_type,
+        suggestions=generate_resume_suggestions(resume_doc, jd_doc, score, matched, missing),
+    )
+
+# --------------------------------------------------
+# MEMOIZED ANALYSIS
+# --------------------------------------------------
+ANALYSIS_CACHE_ENTRIES = int(os.environ.get("ATS_ANALYSIS_CACHE_ENTRIES", 2048))
+ANALYSIS_CACHE_TTL = float(os.environ.get("ATS_ANALYSIS_CACHE_TTL", 3600))
+
+class AnalysisCache:
+    """
+    Thread-safe LRU of AnalysisResults with a TTL, keyed by
+    (resume sha256, JD sha256, ENGINE_VERSION, taxonomy digest, scoring).
+    """
+
+    def __init__(self, max_entries=ANALYSIS_CACHE_ENTRIES, ttl=ANALYSIS_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (expires, result)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            if hit[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return hit[1]
+
+    def put(self, key, result):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, result)
+            self._entries.move_to_end(key)
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or next(iter(self._entries.values()))[0] <= now
+            ):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+_analysis_cache = AnalysisCache()
+
+def _text_hash(text):
+    if isinstance(text, TokenizedDoc):   # e.g. a compiled JobProfile
+        text = text.text
+    return hashlib.sha256((text or "").encode("utf-8")).digest()
+
+def analysis_key(resume_text, jd_text):
+    weights = None
+    if SCORE_MODE != "overlap":
+        from term_weights import get_idf_table
+        weights = get_idf_table().digest
+    return (
+        _text_hash(resume_text),
+        _text_hash(jd_text),
+        ENGINE_VERSION,
+        get_taxonomy().digest,
+        SCORE_MODE,
+        weights,
+    )
+
+def analyze_cached(resume_text, jd_text, cache=None):
+    """
+    analyze(), memoized across calls, reruns and sessions. The result is
+    shared: treat it as read-only (use to_dict() for a private copy).
+    """
+    if cache is None:
+        cache = _analysis_cache
+    key = analysis_key(resume_text, jd_text)
+    result = cache.get(key)
+    if result is None:
+        result = analyze(resume_text, jd_text)
+        cache.put(key, result)
+    return result
@@ -0,0 +1,321 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+from ats_engine import (
+    clean_resume_text,
+    extract_user_details,
+    ats_score,
+    skill_gap,
+    ai_recruiter_confidence,
+    recruiter_decision,
+    SCORE_MODE,
+    SCORE_MODES,
+)
+from doc_tokens import TokenizedDoc, as_doc
+from stage_metrics import HISTOGRAM, PROFILERS, profile
+
+# --------------------------------------------------
+# HEADLESS BATCH SCREENING
+# python batch_screen.py --jd jd.txt --resumes ./resumes --out ranked.csv
+# --------------------------------------------------
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+OUTPUT_FIELDS = [
+    "rank", "file", "name", "email", "ats_score", "semantic_score",
+    "confidence", "decision", "matched_skills", "missing_skills", "error"
+]
+
+
+def collect_resume_paths(resume_dir=None, manifest=None):
+    """
+    Resumes from a directory (recursive) and/or a manifest file
+    listing one path per line (relative to the manifest).
+    """
+    paths = []
+
+    if resume_dir:
+        for root, _, files in os.walk(resume_dir):
+            for f in sorted(files):
+                if f.lower().endswith(RESUME_EXTENSIONS):
+                    paths.append(os.path.join(root, f))
+
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                paths.append(line if os.path.isabs(line) else os.path.join(base, line))
+
+    return paths
+
+
+def load_cleaned_resumes(paths, cache=None, workers=None, timeout=60, memory_mb=1024):
+    """
+    Yields (path, cleaned_text, error): cache hits first, then the misses
+    as the extraction pool finishes them.
+    """
+    from resume_parser import ingest_resumes
+    from text_cache import file_digest
+
+    misses = []
+    digests = {}
+
+    # ---------- CACHE LOOKUP (content hash) ----------
+    for path in paths:
+        if cache is None:
+            misses.append(path)
+            continue
+
+        try:
+            with open(path, "rb") as fh:
+                digest = file_digest(fh.read())
+        except OSError as e:
+            yield path, "", f"{type(e).__name__}: {e}"
+            continue
+
+        hit = cache.get(digest)
+        if hit is not None:
+            yield path, hit[1], None
+        else:
+            digests[path] = digest
+            misses.append(path)
+
+    # ---------- EXTRACT ONLY THE MISSES ----------
+    extracted = ingest_resumes(
+        misses,
+        workers=workers,
+        timeout=timeout,
+        memory_mb=memory_mb
+    )
+    for path, raw, err in extracted:
+        cleaned = ""
+        if err is None:
+            cleaned = cache.put(digests[path], raw) if cache else clean_resume_text(raw)
+        yield path, cleaned, err
+
+
+def screen_text(resume, jd, score_mode=None, idf_table=None):
+    """
+    Same scoring chain the Streamlit app runs for one cleaned resume.
+    The resume is tokenized once here; pass `jd` as a TokenizedDoc so
+    it is tokenized once per batch, and `idf_table` loaded once too.
+    """
+    resume_doc = TokenizedDoc(resume)
+    jd = as_doc(jd)
+
+    details = extract_user_details(resume)
+    score = ats_score(resume_doc, jd, score_mode, idf_table)
+    matched, missing = skill_gap(resume_doc, jd)
+    confidence = ai_recruiter_confidence(resume_doc, matched, missing, score)
+    decision, _ = recruiter_decision(confidence)
+
+    return {
+        "name": details["name"],
+        "email": details["email"],
+        "ats_score": score,
+        "semantic_score": "",
+        "confidence": confidence,
+        "decision": decision,
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "error": ""
+    }
+
+
+def screen_file(path, resume, jd, error=None, score_mode=None, idf_table=None):
+    if error is None:
+        try:
+            row = screen_text(resume, jd, score_mode, idf_table)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+    if error is not None:
+        row = {
+            "name": "", "email": "", "ats_score": 0, "semantic_score": "", "confidence": 0,
+            "decision": "", "matched_skills": [], "missing_skills": [],
+            "error": error
+        }
+    row["file"] = path
+    return row
+
+
+def rank_rows(rows):
+    """
+    Best candidates first; unreadable files sink to the bottom.
+    """
+    rows = sorted(
+        rows,
+        key=lambda r: (bool(r["error"]), -r["confidence"], -r["ats_score"], r["file"])
+    )
+    for i, row in enumerate(rows, 1):
+        row["rank"] = i
+    return rows
+
+
+def write_results(rows, out_path, fmt=None):
+    fmt = fmt or ("jsonl" if out_path.lower().endswith(".jsonl") else "csv")
+
+    with open(out_path, "w", encoding="utf-8", newline="") as fh:
+        if fmt == "jsonl":
+            for row in rows:
+                fh.write(json.dumps({k: row[k] for k in OUTPUT_FIELDS}, ensure_ascii=False) + "\n")
+        else:
+            writer = csv.DictWriter(fh, fieldnames=OUTPUT_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                row = dict(row)
+                row["matched_skills"] = ", ".join(row["matched_skills"])
+                row["missing_skills"] = ", ".join(row["missing_skills"])
+                writer.writerow({k: row[k] for k in OUTPUT_FIELDS})
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Rank a folder or manifest of resumes against one job description."
+    )
+    parser.add_argument("--jd", required=True, help="job description text file or compiled profile (.json)")
+    parser.add_argument("--resumes", help="directory of PDF / DOCX / TXT resumes")
+    parser.add_argument("--manifest", help="file listing one resume path per line")
+    parser.add_argument("--out", required=True, help="output .csv or .jsonl")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="override output format")
+    parser.add_argument("--workers", type=int, help="extraction processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds per extraction task")
+    parser.add_argument("--memory-mb", type=int, default=1024, help="address-space cap per worker")
+    parser.add_argument(
+        "--score-mode", choices=SCORE_MODES,
+        help="ATS score weighting (default: ATS_SCORE_MODE or overlap; tfidf / bm25 need an IDF table)"
+    )
+    parser.add_argument("--idf-table", help="IDF table for tfidf / bm25 (default: ATS_IDF_TABLE)")
+    parser.add_argument("--semantic", action="store_true", help="add MiniLM semantic scores")
+    parser.add_argument(
+        "--semantic-mode", choices=["whole", "max", "mean", "weighted"], default="weighted",
+        help="whole document (truncated by MiniLM) or section chunks aggregated"
+    )
+    parser.add_argument("--batch-size", type=int, default=64, help="resumes per encode batch")
+    parser.add_argument("--cache", help="text cache file (default: ~/.cache/ats_analyzer)")
+    parser.add_argument("--no-cache", action="store_true", help="always re-extract every file")
+    parser.add_argument("--pdf-zip", help="also write one optimized PDF per resume into this ZIP")
+    parser.add_argument("--timings", action="store_true", help="print p50/p95/p99 per stage")
+    parser.add_argument(
+        "--profile", choices=PROFILERS,
+        help="profile the scoring process (extraction workers excluded)"
+    )
+    return parser
+
+
+def print_timings():
+    print(f"{'stage':<22}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}", file=sys.stderr)
+    for stage, s in HISTOGRAM.summary().items():
+        print(
+            f"{stage:<22}{s['count']:>8}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}",
+            file=sys.stderr
+        )
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if not args.resumes and not args.manifest:
+        print("error: pass --resumes and/or --manifest", file=sys.stderr)
+        return 2
+
+    if args.profile:
+        with profile(args.profile) as report:
+            code = run(args)
+        print(report.text, file=sys.stderr)
+    else:
+        code = run(args)
+
+    if args.timings:
+        print_timings()
+    return code
+
+
+def run(args):
+    from job_profile import load_job
+
+    # fail before extracting anything rather than on every row
+    idf_table = None
+    score_mode = args.score_mode or SCORE_MODE
+    if score_mode != "overlap":
+        from term_weights import get_idf_table
+        try:
+            idf_table = get_idf_table(args.idf_table)
+        except (OSError, ValueError) as e:
+            print(
+                f"error: --score-mode {score_mode} needs an IDF table "
+                f"(python term_weights.py build, then --idf-table): {e}",
+                file=sys.stderr
+            )
+            return 2
+
+    jd = load_job(args.jd, idf_table)
+
+    cache = None
+    if not args.no_cache:
+        from text_cache import TextCache
+        cache = TextCache(args.cache)
+
+    paths = collect_resume_paths(args.resumes, args.manifest)
+    rows = []
+    texts = []       # cleaned text per row, for semantic scoring
+
+    for path, cleaned, err in load_cleaned_resumes(
+        paths,
+        cache=cache,
+        workers=args.workers,
+        timeout=args.timeout,
+        memory_mb=args.memory_mb
+    ):
+        rows.append(screen_file(path, cleaned, jd, err, score_mode, idf_table))
+        texts.append(cleaned)
+
+    # ---------- SEMANTIC SCORES (JD encoded once) ----------
+    if args.semantic:
+        from ai_matcher import semantic_match_scores, semantic_match_scores_chunked
+
+        ok = [i for i, row in enumerate(rows) if not row["error"]]
+        if args.semantic_mode == "whole":
+            scores = semantic_match_scores(
+                [texts[i] for i in ok], jd, batch_size=args.batch_size
+            )
+        else:
+            scores = semantic_match_scores_chunked(
+                [texts[i] for i in ok], jd,
+                aggregate=args.semantic_mode, batch_size=args.batch_size
+            )
+        for i, score in zip(ok, scores):
+            rows[i]["semantic_score"] = round(float(score), 2)
+
+    cleaned_by_file = {row["file"]: text for row, text in zip(rows, texts)}
+
+    rows = rank_rows(rows)
+    write_results(rows, args.out, args.format)
+
+    # ---------- OPTIMIZED PDFs (process pool -> ZIP) ----------
+    if args.pdf_zip:
+        from resume_pdf import render_pdfs_to_zip
+
+        written, pdf_failed = render_pdfs_to_zip(
+            (
+                (f"{row['rank']:04d}_{os.path.splitext(os.path.basename(row['file']))[0]}.pdf",
+                 cleaned_by_file[row["file"]])
+                for row in rows if not row["error"]
+            ),
+            jd.text, args.pdf_zip, workers=args.workers
+        )
+        print(f"Wrote {written} PDFs ({len(pdf_failed)} failed) -> {args.pdf_zip}", file=sys.stderr)
+
+    failed = sum(1 for r in rows if r["error"])
+    print(f"Screened {len(rows)} resumes ({failed} failed) -> {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
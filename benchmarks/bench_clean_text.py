@@ -0,0 +1,152 @@
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_engine import clean_resume_text, RESUME_HEADERS
+
+# --------------------------------------------------
+# clean_resume_text: regression corpus + microbenchmark
+# python benchmarks/bench_clean_text.py [--cases N]
+# --------------------------------------------------
+
+def legacy_clean_resume_text(text):
+    """
+    The original one-re.sub-per-header implementation (reference output).
+    """
+    if not text:
+        return ""
+
+    text = text.replace("\r", "\n")
+
+    for h in RESUME_HEADERS:
+        text = re.sub(
+            rf"(?<!\n){h}",
+            f"\n\n{h}",
+            text,
+            flags=re.IGNORECASE
+        )
+
+    text = re.sub(r"[•●▪]", "\n• ", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+
+    return text.strip()
+
+# hand-picked edge cases: nested, overlapping and split headers
+EDGE_CASES = [
+    "",
+    "   ",
+    "SUMMARY",
+    "John Doe PROFESSIONAL SUMMARY Engineer",
+    "\nPROFESSIONAL SUMMARY\nText",
+    "foo TECHNICAL SKILLS python SKILLS sql",
+    "ACADEMIC PROJECTSPERSONAL PROJECTS",
+    "PROJECTSUMMARY",
+    "INTERNSHIP EXPERIENCEDUCATION",
+    "INTERNSHIP EXPERIENCERTIFICATIONS",
+    "INTERNSHIPROJECTS and INTERNSHIPROFESSIONAL SUMMARY",
+    "TECHNICAL SKILLSUMMARY",
+    "CERTIFICATIONSKILLS",
+    "softskills, Skillset and summaryEducation",
+    "ſkills and ſummary",
+    "İnternship ınternship eKperience TECHNİCAL SKİLLS",
+    "\r\nEDUCATION\r\r\n\n\n\nMCA • Python ● SQL ▪ Git\t\t tabs  \n\n\n\n end",
+    "•\n•\n\n\n•   • ",
+    "\n\n\nSKILLS\n\n\n",
+    " \n \n \n \n ",
+]
+
+WORDS = (
+    "python java sql developed built team project university college cgpa "
+    "2022 2024 present intern machine learning data react flask git docker "
+    "skill summary project education technical personal academic experience"
+).split()
+
+PIECES = RESUME_HEADERS + [
+    "•", "●", "▪", " ", "  ", "\t", "\n", "\n\n", "\n\n\n", "\r", "\r\n",
+    "S", "PROJECT", "INTERN", "EXPERIENCE", "ſ", "K", "İ", "ı", "ß",
+]
+
+def random_case(s, rng):
+    mode = rng.random()
+    if mode < 0.5:
+        return s
+    if mode < 0.7:
+        return s.lower()
+    if mode < 0.8:
+        return s.title()
+    return "".join(c.upper() if rng.random() < 0.5 else c.lower() for c in s)
+
+def random_resume(rng, size):
+    parts = []
+    for _ in range(size):
+        if rng.random() < 0.35:
+            parts.append(random_case(rng.choice(PIECES), rng))
+        else:
+            parts.append(rng.choice(WORDS))
+        if rng.random() < 0.6:
+            parts.append(rng.choice([" ", "", "\n", " ", "  "]))
+    return "".join(parts)
+
+def regression_corpus(cases, seed=2024):
+    rng = random.Random(seed)
+    corpus = list(EDGE_CASES)
+    for _ in range(cases):
+        corpus.append(random_resume(rng, rng.randint(1, 400)))
+    return corpus
+
+def check_regressions(corpus):
+    for i, text in enumerate(corpus):
+        expected = legacy_clean_resume_text(text)
+        got = clean_resume_text(text)
+        if got != expected:
+            print(f"MISMATCH on case {i}: {text!r}")
+            print(f"  legacy: {expected!r}")
+            print(f"  new:    {got!r}")
+            return False
+    return True
+
+def realistic_resume(rng, pages):
+    section = (
+        "{h}\n"
+        "• Developed a Flask REST API used by 1200 users  \n"
+        "● Built   data pipelines with Python, Pandas and SQL\t\n"
+        "Worked with the team on machine learning models, 92% accuracy.\n\n\n"
+    )
+    body = []
+    for _ in range(pages * 6):
+        body.append(section.format(h=rng.choice(RESUME_HEADERS).title()))
+        body.append(" ".join(rng.choice(WORDS) for _ in range(60)) + "\r\n")
+    return "".join(body)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="clean_resume_text regression check and benchmark.")
+    parser.add_argument("--cases", type=int, default=5000, help="random regression cases")
+    args = parser.parse_args(argv)
+
+    corpus = regression_corpus(args.cases)
+    if not check_regressions(corpus):
+        return 1
+    print(f"regression: {len(corpus)} cases byte-identical to legacy")
+
+    rng = random.Random(7)
+    for pages in (1, 3, 10):
+        doc = realistic_resume(rng, pages)
+        number = 200
+        legacy = min(timeit.repeat(lambda: legacy_clean_resume_text(doc), number=number, repeat=5))
+        new = min(timeit.repeat(lambda: clean_resume_text(doc), number=number, repeat=5))
+        print(
+            f"{pages:>2} page(s) {len(doc):>7} chars: "
+            f"legacy {legacy / number * 1e6:8.1f} us  "
+            f"new {new / number * 1e6:8.1f} us  "
+            f"speedup x{legacy / new:.2f}"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --------------------------------------------------
+# cold-start cost: python -X importtime per entry point
+# python benchmarks/bench_import_time.py [--repeat N] [--top N] [--budget-ms MS] [module ...]
+# --------------------------------------------------
+
+TARGETS = [
+    "ats_engine", "text_cache", "resume_parser", "resume_pdf",
+    "batch_screen", "ai_matcher", "app.py",
+]
+
+# must only be imported on the code path that needs them
+HEAVY = {
+    "torch", "sentence_transformers", "transformers", "onnxruntime",
+    "reportlab", "plotly", "pdfplumber", "docx",
+}
+
+def run_importtime(target):
+    """
+    [(self_us, cumulative_us, depth, module)] for one fresh interpreter.
+    app.py is executed as a script (streamlit bare mode), modules are imported.
+    """
+    if target.endswith(".py"):
+        code = f"import runpy; runpy.run_path({target!r}, run_name='__main__')"
+    else:
+        code = f"import {target}"
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if proc.returncode:
+        raise RuntimeError(f"{target}: {proc.stderr.strip().splitlines()[-1]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative), depth, name.strip()))
+    return rows
+
+def summarize(rows):
+    total = sum(cumulative for _, cumulative, depth, _ in rows if depth == 0)
+    heavy = sorted({name.split(".")[0] for *_, name in rows} & HEAVY)
+    return total / 1000, heavy
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import time per entry point.")
+    parser.add_argument("targets", nargs="*", metavar="module", help=f"default: {' '.join(TARGETS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per target (best is kept)")
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest modules")
+    parser.add_argument("--budget-ms", type=float, help="fail targets slower than this")
+    args = parser.parse_args(argv)
+    budget = args.budget_ms
+
+    ok = True
+    for target in args.targets or TARGETS:
+        try:
+            runs = [run_importtime(target) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print("IMPORT ERROR:", e)
+            ok = False
+            continue
+
+        # best of N: disk cache and CPU noise only ever add time
+        best = min(runs, key=lambda rows: summarize(rows)[0])
+        total_ms, heavy = summarize(best)
+        over = budget is not None and total_ms > budget
+        ok &= not heavy and not over
+
+        status = "OK"
+        if heavy:
+            status = "HEAVY: " + ", ".join(heavy)
+        elif over:
+            status = f"OVER {budget:.0f} ms"
+        print(f"{target:<14} {total_ms:8.1f} ms  {status}")
+
+        if args.top:
+            for self_us, _, _, name in sorted(best, reverse=True)[:args.top]:
+                print(f"    {self_us / 1000:7.1f} ms  {name}")
+
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# --------------------------------------------------
+# keyword index: incremental insert throughput + boolean / phrase
+# query latency on a synthetic pool, checked against a latency budget
+# python benchmarks/bench_keyword_index.py --n 500000 --budget-ms 100
+# --------------------------------------------------
+
+QUERIES = [
+    "python AND (django OR flask) AND NOT intern",
+    '"machine learning" AND sql',
+    "docker OR kubernetes OR aws",
+    '"data warehouse" NOT tableau',
+    "java spring microservices",
+    "NOT python",
+]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keyword index benchmark.")
+    parser.add_argument("--n", type=int, default=20000, help="resumes to index")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=1000, help="resumes per insert")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per query")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="p95 limit per query")
+    parser.add_argument("--index", help="index file (default: a temp file)")
+    args = parser.parse_args(argv)
+
+    from corpus import make_resume
+    from keyword_index import KeywordIndex
+
+    path = args.index or os.path.join(tempfile.mkdtemp(prefix="ats_bench_kw_"), "index.sqlite3")
+    index = KeywordIndex(path)
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    written = 0
+    while written < args.n:
+        size = min(args.batch_size, args.n - written)
+        texts = [make_resume(rng, rng.choice((1, 1, 2)))[0] for _ in range(size)]
+        index.add_texts([f"cand-{written + i}" for i in range(size)], texts)
+        written += size
+    took = time.perf_counter() - start
+    print(f"indexed {written} resumes in {took:.1f} s ({written / took:.0f}/s incl. generation)")
+    print(index.stats())
+
+    over = []
+    print(f"{'query':<48}{'matches':>9}{'p50 ms':>10}{'p95 ms':>10}")
+    for query in QUERIES:
+        samples = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            total, _ = index.search(query, 20)
+            samples.append((time.perf_counter() - t0) * 1000)
+        p50, p95 = np.percentile(samples, [50, 95])
+        print(f"{query:<48}{total:>9}{p50:>10.2f}{p95:>10.2f}")
+        if p95 > args.budget_ms:
+            over.append(query)
+
+    for query in over:
+        print(f"OVER BUDGET ({args.budget_ms:.0f} ms p95): {query}")
+    return 1 if over else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_matcher import encode_texts
+
+# --------------------------------------------------
+# ONNX / int8 backends vs torch: score parity + encode latency
+# python benchmarks/bench_onnx_parity.py [--pairs N] [--backends onnx,onnx-int8]
+# --------------------------------------------------
+
+# max |score difference| on the 0–100 scale before a backend fails
+TOLERANCE = {"onnx": 0.05, "onnx-int8": 2.0}
+# int8 must still rank candidates the same way, almost always
+MIN_RANK_AGREEMENT = 0.95
+
+WORDS = (
+    "python sql machine learning pandas numpy excel power bi tableau aws "
+    "docker react django flask api dashboard analysis model data pipeline "
+    "team project built led improved reduced customer sales report cloud "
+    "statistics deep learning java javascript html css git linux testing"
+).split()
+
+def random_texts(rng, n, low=20, high=400):
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))) for _ in range(n)]
+
+def timed_encode(texts, backend):
+    encode_texts(texts[:4], use_store=False, backend=backend)   # model load / warm-up
+    start = time.perf_counter()
+    embs = encode_texts(texts, use_store=False, backend=backend)
+    return embs, (time.perf_counter() - start) / len(texts) * 1000
+
+def rank_agreement(a, b):
+    """
+    Share of resume pairs ordered the same way by both score vectors.
+    """
+    i, j = np.triu_indices(len(a), k=1)
+    return float(np.mean(np.sign(a[i] - a[j]) == np.sign(b[i] - b[j])))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ONNX backends vs torch: parity and latency.")
+    parser.add_argument("--pairs", type=int, default=200, help="resumes scored against each JD")
+    parser.add_argument(
+        "--backends", default="onnx,onnx-int8",
+        help=f"comma-separated, any of {', '.join(TOLERANCE)}"
+    )
+    args = parser.parse_args(argv)
+    pairs = args.pairs
+    backends = args.backends.split(",")
+    unknown = [b for b in backends if b not in TOLERANCE]
+    if unknown:
+        parser.error(f"unknown backend: {', '.join(unknown)}")
+
+    rng = random.Random(13)
+    resumes = random_texts(rng, pairs)
+    jds = random_texts(rng, 5, 40, 200)
+
+    reference, torch_ms = timed_encode(resumes + jds, "torch")
+    reference = reference[:pairs] @ reference[pairs:].T * 100
+    print(f"torch      {torch_ms:7.2f} ms/text")
+
+    ok = True
+    for backend in backends:
+        embs, ms = timed_encode(resumes + jds, backend)
+        scores = embs[:pairs] @ embs[pairs:].T * 100
+        diff = float(np.abs(scores - reference).max())
+        agree = min(rank_agreement(scores[:, j], reference[:, j]) for j in range(len(jds)))
+        passed = diff <= TOLERANCE[backend] and agree >= MIN_RANK_AGREEMENT
+        ok &= passed
+        print(
+            f"{backend:<10} {ms:7.2f} ms/text  speedup x{torch_ms / ms:.2f}  "
+            f"max |diff| {diff:.3f}  rank agreement {agree:.3f}  "
+            f"{'OK' if passed else 'FAIL'}"
+        )
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# --------------------------------------------------
+# score matrix: parity with ats_score / skill_gap on sampled pairs,
+# and block throughput vs the pairwise loop it replaces
+# python benchmarks/bench_score_matrix.py --resumes 5000 --jds 500
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Many x many score matrix benchmark.")
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--jds", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--block-rows", type=int, default=1024)
+    parser.add_argument("--pairs", type=int, default=2000, help="sampled pairs for parity / loop timing")
+    args = parser.parse_args(argv)
+
+    from corpus import make_jd, make_resume
+    from ats_engine import ats_score, skill_gap
+    from doc_tokens import TokenizedDoc
+    from score_matrix import JdMatrix, score_blocks
+    from skill_taxonomy import get_taxonomy
+
+    rng = random.Random(args.seed)
+    jds = [make_jd(rng) for _ in range(args.jds)]
+    resumes = [make_resume(rng, rng.choice((1, 2)))[0] for _ in range(args.resumes)]
+
+    start = time.perf_counter()
+    matrix = JdMatrix(jds)
+    ats = np.zeros((len(resumes), len(jds)), dtype=np.uint8)
+    skills = np.zeros((len(resumes), len(jds)), dtype=np.uint16)
+    for first, block in score_blocks(matrix, resumes, args.block_rows):
+        ats[first:first + len(block["ats"])] = block["ats"]
+        skills[first:first + len(block["skills"])] = block["skills"]
+    took = time.perf_counter() - start
+    cells = len(resumes) * len(jds)
+    print(f"matrix: {len(resumes)} x {len(jds)} in {took:.2f} s ({cells / took:,.0f} pairs/s)")
+
+    pairs = [(rng.randrange(len(resumes)), rng.randrange(len(jds))) for _ in range(args.pairs)]
+    # the loop gets every doc pre-tokenized, as batch_screen would
+    jd_docs = [TokenizedDoc(jd) for jd in jds]
+    resume_docs = {i: TokenizedDoc(resumes[i]) for i, _ in pairs}
+    matcher = get_taxonomy().matcher
+    mismatches = 0
+    start = time.perf_counter()
+    for i, j in pairs:
+        resume = resume_docs[i]
+        score = ats_score(resume, jd_docs[j], "overlap")
+        matched, _ = skill_gap(resume, jd_docs[j])
+        found = matcher.find_doc(resume)
+        full = sum(1 for s in matcher.find_doc(jd_docs[j]) if s in found)
+        if score != ats[i, j] or full != skills[i, j] or len(matched) != min(10, full):
+            mismatches += 1
+    loop = (time.perf_counter() - start) / len(pairs)
+    print(f"pairwise loop: {1 / loop:,.0f} pairs/s (x{loop * cells / took:.0f} slower on the full grid)")
+
+    print(f"parity: {len(pairs) - mismatches}/{len(pairs)} sampled pairs identical")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# --------------------------------------------------
+# end-to-end benchmark: every public stage on a synthetic corpus,
+# throughput + latency percentiles as JSON, regression check vs baseline
+# python benchmarks/bench_suite.py --n 100 --out results.json --baseline baseline.json
+# python benchmarks/bench_suite.py --n 100 --save-baseline baseline.json
+# --------------------------------------------------
+
+PERCENTILES = (50, 90, 95, 99)
+# a stage regresses when its p50 or p95 grows by more than this fraction
+DEFAULT_TOLERANCE = 0.25
+
+def cold_caches():
+    """
+    Per-text memo caches, cleared so each timed call does the full work.
+    """
+    from ats_engine import _normalize_blank_run, section_outline, segment_sections
+    from doc_tokens import tokenize
+
+    for fn in (tokenize, section_outline, segment_sections, _normalize_blank_run):
+        fn.cache_clear()
+
+def stage_stats(samples):
+    samples = np.asarray(samples, dtype=np.float64)
+    stats = {
+        "count": int(samples.size),
+        "total_s": round(float(samples.sum()), 6),
+        "throughput_per_s": round(float(samples.size / samples.sum()), 2) if samples.sum() else None,
+        "mean_ms": round(float(samples.mean() * 1000), 4),
+    }
+    for p in PERCENTILES:
+        stats[f"p{p}_ms"] = round(float(np.percentile(samples, p) * 1000), 4)
+    return stats
+
+class StageTimer:
+    """
+    Per-item latency of each stage; with repeats, an item keeps its
+    fastest run (noise only ever adds time).
+    """
+
+    def __init__(self):
+        self.best = {}
+
+    def time(self, stage, item, fn, *args, cold=True):
+        if cold:
+            cold_caches()
+        start = time.perf_counter()
+        out = fn(*args)
+        elapsed = time.perf_counter() - start
+
+        runs = self.best.setdefault(stage, {})
+        runs[item] = min(elapsed, runs.get(item, elapsed))
+        return out
+
+    def results(self):
+        return {stage: stage_stats(list(runs.values())) for stage, runs in sorted(self.best.items())}
+
+def run_suite(manifest, repeat=5, semantic=False, pdf=True):
+    from ats_engine import analyze, clean_resume_text, extract_user_details, skill_gap
+    from resume_parser import extract_text_from_docx, extract_text_from_pdf
+
+    jds = []
+    for path in manifest["jds"]:
+        with open(path, encoding="utf-8") as fh:
+            jds.append(fh.read())
+
+    timer = StageTimer()
+    cleaned = []
+    for _ in range(repeat):
+        cleaned = []
+        for i, entry in enumerate(manifest["resumes"]):
+            path, fmt = entry["path"], entry["format"]
+            if fmt == "pdf":
+                raw = timer.time("extract_text_from_pdf", i, extract_text_from_pdf, path)
+            elif fmt == "docx":
+                raw = timer.time("extract_text_from_docx", i, extract_text_from_docx, path)
+            else:
+                with open(path, encoding="utf-8") as fh:
+                    raw = fh.read()
+
+            text = timer.time("clean_resume_text", i, clean_resume_text, raw)
+            jd = jds[i % len(jds)]
+            timer.time("extract_user_details", i, extract_user_details, text)
+            timer.time("skill_gap", i, skill_gap, text, jd)
+            timer.time("analyze", i, analyze, text, jd)
+            cleaned.append(text)
+
+    if pdf:
+        try:
+            import reportlab  # noqa: F401
+        except ImportError:
+            print("BENCH: reportlab not installed, skipping PDF generation", file=sys.stderr)
+            pdf = False
+
+    if pdf:
+        from resume_pdf import generate_optimized_resume_pdf
+
+        for _ in range(repeat):
+            for i, text in enumerate(cleaned):
+                jd = jds[i % len(jds)]
+                result = analyze(text, jd)
+                timer.time(
+                    "generate_optimized_resume_pdf", i, generate_optimized_resume_pdf,
+                    result.details, result.matched, result.missing, text, jd
+                )
+
+    if semantic:
+        # fresh embedding store: every encode is a real model call (one pass only)
+        import ai_matcher
+        import embedding_store
+
+        embedding_store.DEFAULT_STORE_DIR = tempfile.mkdtemp(prefix="ats_bench_emb_")
+        ai_matcher.get_embedding_store.cache_clear()
+        ai_matcher.load_model()
+        ai_matcher.encode_texts(["warm up"], use_store=False)
+        for i, text in enumerate(cleaned):
+            timer.time(
+                "semantic_match_score", i, ai_matcher.semantic_match_score,
+                text, jds[i % len(jds)], cold=False
+            )
+
+    return timer.results()
+
+def compare(results, baseline, tolerance):
+    """
+    [(stage, metric, baseline ms, current ms, ratio)] over the tolerance.
+    """
+    regressions = []
+    for stage, stats in results["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if base[metric] and stats[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    (stage, metric, base[metric], stats[metric], stats[metric] / base[metric])
+                )
+    return regressions
+
+def print_table(stages):
+    print(f"{'stage':<32}{'n':>6}{'items/s':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, s in stages.items():
+        print(
+            f"{stage:<32}{s['count']:>6}{s['throughput_per_s'] or 0:>11.1f}"
+            f"{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}"
+        )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ATS analyzer benchmark suite.")
+    parser.add_argument("--corpus", help="corpus dir (generated if it has no manifest.json)")
+    parser.add_argument("--n", type=int, default=60, help="resumes to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="passes; each item keeps its best")
+    parser.add_argument("--semantic", action="store_true", help="include MiniLM scoring")
+    parser.add_argument("--no-pdf", action="store_true", help="skip optimized PDF generation")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="fail on regressions against this results JSON")
+    parser.add_argument("--save-baseline", help="write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    from corpus import generate_corpus
+
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix="ats_bench_corpus_")
+    manifest_path = os.path.join(corpus_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    else:
+        manifest = generate_corpus(corpus_dir, args.n, args.seed)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": manifest["seed"],
+            "resumes": len(manifest["resumes"]),
+            "formats": sorted({r["format"] for r in manifest["resumes"]}),
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "stages": run_suite(manifest, args.repeat, args.semantic, not args.no_pdf),
+    }
+    print_table(results["stages"])
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(results, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline, args.tolerance)
+        for stage, metric, before, now, ratio in regressions:
+            print(f"REGRESSION {stage} {metric}: {before:.3f} -> {now:.3f} ms (x{ratio:.2f})")
+        if regressions:
+            return 1
+        print(f"no regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_taxonomy import get_taxonomy
+
+# --------------------------------------------------
+# synthetic resume / JD corpus (deterministic per seed)
+# python benchmarks/corpus.py --out /tmp/ats_corpus --n 200 --seed 42
+# PDF needs reportlab, DOCX needs python-docx; missing ones are skipped
+# --------------------------------------------------
+
+FIRST_NAMES = [
+    "Aarav", "Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Karthik", "Divya",
+    "John", "Maria", "Wei", "Fatima", "Lucas", "Emma", "Omar", "Yuki",
+]
+LAST_NAMES = [
+    "Sharma", "Iyer", "Reddy", "Nair", "Patel", "Kumar", "Menon", "Das",
+    "Smith", "Garcia", "Chen", "Khan", "Silva", "Muller", "Hassan", "Tanaka",
+]
+TITLES = [
+    "Data Analyst", "Software Engineer", "Backend Developer", "ML Engineer",
+    "Full Stack Developer", "BI Developer", "Data Scientist", "Python Developer",
+]
+COMPANIES = ["Infosys", "TCS", "Zoho", "Freshworks", "Wipro", "Accenture", "Acme Corp", "Globex"]
+DEGREES = ["B.E Computer Science", "B.Tech Information Technology", "MCA", "M.Sc Data Science", "BCA"]
+INSTITUTIONS = ["Anna University", "VIT University", "SRM Institute", "PSG College of Technology"]
+VERBS = ["Developed", "Built", "Implemented", "Designed", "Trained", "Created", "Integrated", "Led"]
+OBJECTS = [
+    "a reporting dashboard", "an ETL pipeline", "a REST API", "a churn prediction model",
+    "a recommendation engine", "an inventory system", "a data warehouse", "a chatbot",
+]
+IMPACT = [
+    "reducing report time by {n}%", "serving {n}00 daily users", "reaching {n}% accuracy",
+    "cutting costs by {n}%", "processing {n}k records per day", "",
+]
+FILLER = (
+    "collaborated with cross functional team members to gather requirements "
+    "wrote documentation reviewed code mentored juniors communicated results "
+    "to stakeholders followed agile practices and delivered on schedule"
+).split()
+
+SECTIONS = [
+    "PROFESSIONAL SUMMARY", "TECHNICAL SKILLS", "WORK EXPERIENCE", "INTERNSHIP EXPERIENCE",
+    "PROJECTS", "EDUCATION", "CERTIFICATIONS", "ACHIEVEMENTS", "HOBBIES",
+]
+HEADER_STYLES = ("upper", "title", "colon", "inline")
+WORDS_PER_PAGE = 450
+
+def _header(name, style):
+    if style == "title":
+        return name.title()
+    if style == "colon":
+        return name + ":"
+    return name
+
+def _sentence(rng, skills):
+    impact = rng.choice(IMPACT).format(n=rng.randint(10, 95))
+    used = ", ".join(rng.sample(skills, min(len(skills), rng.randint(1, 3))))
+    filler = " ".join(rng.sample(FILLER, rng.randint(4, 12)))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {used} {impact}; {filler}."
+
+def _section_body(rng, section, skills, words):
+    lines = []
+    if section == "TECHNICAL SKILLS":
+        return [", ".join(skills)]
+    if section == "EDUCATION":
+        year = rng.randint(2012, 2025)
+        return [
+            f"{rng.choice(DEGREES)} {year}",
+            rng.choice(INSTITUTIONS),
+            f"CGPA: {rng.uniform(6.5, 9.8):.2f}",
+        ]
+    if section in ("WORK EXPERIENCE", "INTERNSHIP EXPERIENCE"):
+        role = rng.choice(TITLES) + (" Intern" if section.startswith("INTERN") else "")
+        lines.append(f"{role} - {rng.choice(COMPANIES)}")
+        lines.append(f"Jun {rng.randint(2015, 2023)} - Present")
+    if section == "PROJECTS":
+        lines.append(f"{rng.choice(OBJECTS).split(' ', 1)[1].title()}")
+
+    count = 0
+    while count < words:
+        sentence = _sentence(rng, skills)
+        lines.append("• " + sentence)
+        count += len(sentence.split())
+    return lines
+
+def make_resume(rng, pages=1):
+    """
+    (text, layout) for one synthetic resume of roughly `pages` pages.
+    """
+    taxonomy = get_taxonomy()
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(taxonomy.skills, rng.randint(4, min(14, len(taxonomy.skills))))
+    style = rng.choice(HEADER_STYLES)
+
+    sections = ["PROFESSIONAL SUMMARY", "TECHNICAL SKILLS", "EDUCATION"]
+    sections += [s for s in SECTIONS if s not in sections and rng.random() < 0.6]
+    rng.shuffle(sections)
+
+    budget = pages * WORDS_PER_PAGE
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | +91 9{rng.randint(100000000, 999999999)}",
+        f"https://www.linkedin.com/in/{first.lower()}{last.lower()} https://github.com/{first.lower()}{rng.randint(1, 99)}",
+    ]
+    for section in sections:
+        body = _section_body(rng, section, skills, budget // len(sections))
+        header = _header(section, style)
+        if style == "inline":
+            # pdf-style extraction: header glued to the previous line
+            lines[-1] += " " + header
+        else:
+            lines.append(header)
+        lines.extend(body)
+
+    return "\n".join(lines), {"pages": pages, "header_style": style, "sections": sections}
+
+def make_jd(rng):
+    taxonomy = get_taxonomy()
+    title = rng.choice(TITLES)
+    required = rng.sample(taxonomy.skills, rng.randint(5, min(12, len(taxonomy.skills))))
+    duties = [_sentence(rng, required) for _ in range(rng.randint(4, 9))]
+    return "\n".join(
+        [f"{title} - {rng.choice(COMPANIES)}", "", "Requirements:"]
+        + [f"- Experience with {s}" for s in required]
+        + ["", "Responsibilities:"]
+        + [f"- {d}" for d in duties]
+    )
+
+# ---------------- writers ----------------
+
+def write_text(text, path):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+
+def write_pdf(text, path):
+    from xml.sax.saxutils import escape
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    style = getSampleStyleSheet()["BodyText"]
+    doc = SimpleDocTemplate(path, pagesize=A4)
+    doc.build([Paragraph(escape(line), style) for line in text.splitlines() if line.strip()])
+
+def write_docx(text, path):
+    from docx import Document
+
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    doc.save(path)
+
+WRITERS = {"txt": write_text, "pdf": write_pdf, "docx": write_docx}
+
+def available_formats(formats):
+    out = []
+    for fmt in formats:
+        try:
+            if fmt == "pdf":
+                import reportlab  # noqa: F401
+            elif fmt == "docx":
+                import docx  # noqa: F401
+        except ImportError:
+            print(f"CORPUS: skipping {fmt} (library not installed)", file=sys.stderr)
+            continue
+        out.append(fmt)
+    return out
+
+def generate_corpus(out_dir, n=100, seed=42, formats=("txt", "pdf", "docx"), jds=5):
+    """
+    Writes n resumes (formats in rotation, 1–5 pages) and `jds` JDs plus a
+    manifest.json; returns the manifest.
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    formats = available_formats(formats) or ["txt"]
+
+    manifest = {"seed": seed, "resumes": [], "jds": []}
+    for i in range(n):
+        pages = rng.choice((1, 1, 2, 2, 3, 5))
+        text, layout = make_resume(rng, pages)
+        fmt = formats[i % len(formats)]
+        path = os.path.join(out_dir, f"resume_{i:04d}.{fmt}")
+        WRITERS[fmt](text, path)
+        manifest["resumes"].append({"path": path, "format": fmt, **layout})
+
+    for i in range(jds):
+        path = os.path.join(out_dir, f"jd_{i:02d}.txt")
+        write_text(make_jd(rng), path)
+        manifest["jds"].append(path)
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    return manifest
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume / JD corpus.")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--n", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--formats", default="txt,pdf,docx")
+    args = parser.parse_args(argv)
+
+    manifest = generate_corpus(args.out, args.n, args.seed, args.formats.split(","), args.jds)
+    print(f"{len(manifest['resumes'])} resumes, {len(manifest['jds'])} JDs -> {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+# ================= SHARED TOKENIZATION =================
+# one pass per resume / JD; every scorer reads from the same object
+
+WORD_PATTERN = re.compile(r"\b[a-zA-Z]{3,}\b")
+
+class TokenizedDoc:
+    """
+    Lowered text, alphabetic tokens (3+ letters, in order) and the
+    sets / counts / n-grams derived from them, each built on first use.
+    """
+
+    def __init__(self, text):
+        self.text = text or ""
+        self.lower = self.text.lower()
+        self.words = WORD_PATTERN.findall(self.lower)
+        self._sets = {}
+        self._ordered = {}
+        self._ngrams = {}
+        self._counts = None
+        self._split_len = None
+        self._memo = {}
+
+    def word_set(self, min_len=3):
+        """
+        Same as set(re.findall(rf"\b[a-zA-Z]{{{min_len},}}\b", text.lower())).
+        """
+        found = self._sets.get(min_len)
+        if found is None:
+            if min_len <= 3:
+                found = frozenset(self.words)
+            else:
+                found = frozenset(w for w in self.word_set() if len(w) >= min_len)
+            self._sets[min_len] = found
+        return found
+
+    def ordered_words(self, min_len=3):
+        """
+        Unique tokens in first-seen order.
+        """
+        found = self._ordered.get(min_len)
+        if found is None:
+            found = list(dict.fromkeys(w for w in self.words if len(w) >= min_len))
+            self._ordered[min_len] = found
+        return found
+
+    @property
+    def counts(self):
+        if self._counts is None:
+            self._counts = Counter(self.words)
+        return self._counts
+
+    def ngrams(self, n=2):
+        found = self._ngrams.get(n)
+        if found is None:
+            found = frozenset(
+                " ".join(self.words[i:i + n])
+                for i in range(len(self.words) - n + 1)
+            )
+            self._ngrams[n] = found
+        return found
+
+    @property
+    def split_len(self):
+        """
+        len(text.split()), the word count used for the short-resume penalty.
+        """
+        if self._split_len is None:
+            self._split_len = len(self.text.split())
+        return self._split_len
+
+    def memo(self, key, build):
+        """
+        Per-document cache for derived artifacts (e.g. skill hits).
+        """
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+@lru_cache(maxsize=256)
+def tokenize(text):
+    return TokenizedDoc(text)
+
+def as_doc(value):
+    """
+    Scorers accept raw text or an already built TokenizedDoc.
+    """
+    if isinstance(value, TokenizedDoc):
+        return value
+    return tokenize(value or "")
@@ -0,0 +1,199 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers serialized per process only
+    fcntl = None
+
+# ================= PERSISTENT EMBEDDING STORE =================
+# key: (model name, sha256 of the clean_text output)
+# vectors: one append-only row-major file per model, read via np.memmap
+# index:   SQLite (model, digest) -> row
+# rows are never rewritten, so readers never need a lock
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "ATS_EMBEDDING_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ats_analyzer", "embeddings")
+)
+
+def text_digest(normalized_text):
+    return hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+
+class EmbeddingStore:
+    """
+    Disk-backed embedding cache shared across processes and restarts.
+    """
+
+    def __init__(self, root=None, dtype="float32"):
+        self.root = root or DEFAULT_STORE_DIR
+        os.makedirs(self.root, exist_ok=True)
+        self.dtype = np.dtype(dtype)
+        self._maps = {}
+        self._local_lock = threading.Lock()
+
+        with self._db() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    row INTEGER NOT NULL,
+                    PRIMARY KEY (model, digest)
+                )
+            """)
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS models (
+                    model TEXT PRIMARY KEY,
+                    dim INTEGER NOT NULL,
+                    dtype TEXT NOT NULL
+                )
+            """)
+
+    # ---------------- internals ----------------
+
+    @contextmanager
+    def _db(self):
+        db = sqlite3.connect(os.path.join(self.root, "index.sqlite3"), timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _write_lock(self):
+        with self._local_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.root, "write.lock"), "a") as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _vector_path(self, model):
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", model)
+        return os.path.join(self.root, f"{slug}.{self.dtype.name}")
+
+    def _model_dim(self, db, model):
+        row = db.execute("SELECT dim, dtype FROM models WHERE model = ?", (model,)).fetchone()
+        if row is None:
+            return None
+        if row[1] != self.dtype.name:
+            raise ValueError(f"{model} is stored as {row[1]}, not {self.dtype.name}")
+        return row[0]
+
+    def _matrix(self, model, dim, min_rows):
+        """
+        memmap of the model's vectors, remapped when it has grown.
+        """
+        current = self._maps.get(model)
+        if current is not None and current.shape[0] >= min_rows:
+            return current
+
+        path = self._vector_path(model)
+        rows = os.path.getsize(path) // (dim * self.dtype.itemsize)
+        current = np.memmap(path, dtype=self.dtype, mode="r", shape=(rows, dim))
+        self._maps[model] = current
+        return current
+
+    def _rows_for(self, db, model, digests):
+        found = {}
+        digests = list(dict.fromkeys(digests))
+        for i in range(0, len(digests), 500):
+            chunk = digests[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(db.execute(
+                f"SELECT digest, row FROM embeddings WHERE model = ? AND digest IN ({marks})",
+                [model, *chunk]
+            ).fetchall())
+        return found
+
+    # ---------------- public API ----------------
+
+    def get_many(self, model, digests):
+        """
+        {digest: float32 vector} for the digests already stored.
+        """
+        with self._db() as db:
+            dim = self._model_dim(db, model)
+            if dim is None:
+                return {}
+            rows = self._rows_for(db, model, digests)
+
+        if not rows:
+            return {}
+
+        matrix = self._matrix(model, dim, max(rows.values()) + 1)
+        return {d: np.asarray(matrix[r], dtype=np.float32) for d, r in rows.items()}
+
+    def put_many(self, model, digests, vectors):
+        """
+        Appends vectors for digests not stored yet (other writers may race us).
+        """
+        vectors = np.asarray(vectors)
+        if not len(digests):
+            return
+        dim = vectors.shape[1]
+
+        with self._write_lock(), self._db() as db:
+            stored_dim = self._model_dim(db, model)
+            if stored_dim is None:
+                db.execute(
+                    "INSERT INTO models VALUES (?, ?, ?)", (model, dim, self.dtype.name)
+                )
+            elif stored_dim != dim:
+                raise ValueError(f"{model} vectors are {stored_dim}-d, got {dim}-d")
+
+            existing = self._rows_for(db, model, digests)
+            new = {}
+            for i, d in enumerate(digests):
+                if d not in existing and d not in new:
+                    new[d] = i
+            if not new:
+                return
+
+            path = self._vector_path(model)
+            row_bytes = dim * self.dtype.itemsize
+
+            with open(path, "ab") as fh:
+                # drop a torn row left by a writer that crashed mid-append
+                start = fh.seek(0, os.SEEK_END) // row_bytes
+                fh.truncate(start * row_bytes)
+                fh.seek(start * row_bytes)
+                fh.write(vectors[list(new.values())].astype(self.dtype).tobytes())
+                fh.flush()
+                os.fsync(fh.fileno())
+
+            # index rows only once their bytes are on disk
+            db.executemany(
+                "INSERT INTO embeddings VALUES (?, ?, ?)",
+                [(model, d, start + k) for k, d in enumerate(new)]
+            )
+
+    def matrix(self, model):
+        """
+        (digests, read-only N x dim matrix) of everything stored for a model.
+        """
+        with self._db() as db:
+            dim = self._model_dim(db, model)
+            if dim is None:
+                return [], np.zeros((0, 0), dtype=self.dtype)
+            pairs = db.execute(
+                "SELECT digest, row FROM embeddings WHERE model = ? ORDER BY row", (model,)
+            ).fetchall()
+
+        if not pairs:
+            return [], np.zeros((0, dim), dtype=self.dtype)
+
+        matrix = self._matrix(model, dim, pairs[-1][1] + 1)
+        return [d for d, _ in pairs], matrix[[r for _, r in pairs]]
@@ -0,0 +1,172 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+from doc_tokens import TokenizedDoc
+from skill_taxonomy import get_taxonomy
+
+# ================= COMPILED JOB PROFILE =================
+# one JD, compiled once per requisition and shared by every worker
+# python job_profile.py --jd jd.txt --out backend_dev.profile.json --semantic
+# python batch_screen.py --jd backend_dev.profile.json --resumes ./resumes --out ranked.csv
+#
+# the text is the source of truth: tokens are rebuilt on load (one regex
+# pass), while skill hits, keyword weights and the embedding are stored
+# with the taxonomy / IDF table / model they came from and only reused
+# when those still match
+
+PROFILE_FORMAT = 1
+PROFILE_SUFFIX = ".json"
+
+class JobProfile(TokenizedDoc):
+    """
+    A JD with its tokens, required skills, keyword weights and optional
+    embedding precomputed. Accepted wherever a scorer takes JD text.
+    """
+
+    def __init__(self, text, embedding=None, embedding_model=None):
+        super().__init__(text)
+        self.digest = hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+        self.embedding = embedding
+        self.embedding_model = embedding_model
+
+    @classmethod
+    def compile(cls, text, idf_table=None, embed=False):
+        """
+        Builds every artifact the scorers read from a JD. `idf_table`
+        (term_weights.IdfTable) adds keyword weights; `embed` encodes the
+        JD with the current model backend.
+        """
+        profile = cls(text)
+        profile.word_set()
+        profile.word_set(5)
+        profile.ordered_words(5)
+        profile.counts
+        get_taxonomy().matcher.find_doc(profile)
+
+        if idf_table is not None:
+            idf_table.weights(profile)
+        if embed:
+            from ai_matcher import encode_texts, store_key
+            profile.embedding = encode_texts([profile.text])[0]
+            profile.embedding_model = store_key()
+        return profile
+
+    @property
+    def required_skills(self):
+        """
+        Taxonomy skills the JD asks for, in taxonomy order.
+        """
+        taxonomy = get_taxonomy()
+        hits = taxonomy.matcher.find_doc(self)
+        return [s for s in taxonomy.skills if s in hits]
+
+    def keyword_weights(self, idf_table):
+        return idf_table.weights(self)
+
+    # ---------------- serialization ----------------
+
+    def to_dict(self):
+        taxonomy = get_taxonomy()
+        data = {
+            "format": PROFILE_FORMAT,
+            "digest": self.digest,
+            "text": self.text,
+            "taxonomy": None,
+            "skills": None,
+            "idf_table": None,
+            "weights": None,
+            "embedding_model": None,
+            "embedding": None,
+        }
+        hits = self._memo.get(("skills", taxonomy.matcher))
+        if hits is not None:
+            data["taxonomy"] = taxonomy.digest
+            data["skills"] = {s: [list(span) for span in spans] for s, spans in hits.items()}
+        for key, weights in self._memo.items():
+            if key[0] == "idf":
+                data["idf_table"], data["weights"] = key[1], weights
+        if self.embedding is not None:
+            data["embedding_model"] = self.embedding_model
+            data["embedding"] = np.asarray(self.embedding, dtype=np.float32).tolist()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("format") != PROFILE_FORMAT:
+            raise ValueError(f"unsupported job profile format: {data.get('format')}")
+
+        embedding = data.get("embedding")
+        profile = cls(
+            data["text"],
+            embedding=None if embedding is None else np.asarray(embedding, dtype=np.float32),
+            embedding_model=data.get("embedding_model"),
+        )
+        if profile.digest != data.get("digest", profile.digest):
+            raise ValueError("job profile text does not match its digest")
+
+        taxonomy = get_taxonomy()
+        if data.get("skills") is not None and data.get("taxonomy") == taxonomy.digest:
+            profile._memo[("skills", taxonomy.matcher)] = {
+                s: [tuple(span) for span in spans] for s, spans in data["skills"].items()
+            }
+        if data.get("weights") is not None:
+            profile._memo[("idf", data["idf_table"])] = data["weights"]
+        return profile
+
+    def __reduce__(self):
+        # pool workers receive the compiled artifacts, not just the text
+        return (JobProfile.from_dict, (self.to_dict(),))
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
+
+def load_job(path, idf_table=None):
+    """
+    A saved profile (*.json) as is, or a JD text file compiled on the spot.
+    """
+    if path.endswith(PROFILE_SUFFIX):
+        return JobProfile.load(path)
+    with open(path, encoding="utf-8") as fh:
+        return JobProfile.compile(fh.read(), idf_table)
+
+# ================= CLI =================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a JD into a reusable job profile.")
+    parser.add_argument("--jd", required=True, help="job description text file")
+    parser.add_argument("--out", required=True, help="profile file (.json)")
+    parser.add_argument("--idf-table", help="include keyword weights from this IDF table")
+    parser.add_argument("--semantic", action="store_true", help="include the JD embedding")
+    args = parser.parse_args(argv)
+
+    if not args.out.endswith(PROFILE_SUFFIX):
+        parser.error(f"--out must end with {PROFILE_SUFFIX}")
+
+    table = None
+    if args.idf_table:
+        from term_weights import get_idf_table
+        table = get_idf_table(args.idf_table)
+
+    with open(args.jd, encoding="utf-8") as fh:
+        profile = JobProfile.compile(fh.read(), table, embed=args.semantic)
+    profile.save(args.out)
+
+    skills = profile.required_skills
+    print(f"{len(skills)} required skills ({', '.join(skills[:8])}) -> {args.out}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
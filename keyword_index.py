@@ -0,0 +1,662 @@
+import argparse
+import bisect
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from doc_tokens import WORD_PATTERN, as_doc
+from skill_taxonomy import get_taxonomy
+from stage_metrics import timed
+
+# ================= KEYWORD INDEX (BOOLEAN / PHRASE SEARCH) =================
+# python keyword_index.py add --resumes ./resumes
+# python keyword_index.py query 'python AND (django OR flask) AND NOT intern'
+# python keyword_index.py query '"machine learning" sql' -n 50
+# python keyword_index.py query 'c++ OR c# OR node.js'
+#
+# positional inverted index over the doc_tokens words ats_score reads,
+# plus a "skill:<name>" term per taxonomy skill hit (what skill_gap
+# reads), so skills the word tokens cannot spell (c++, c#, r, node.js)
+# are searchable too. Skill terms follow the taxonomy at indexing time.
+# Each insert batch becomes a segment; a term's posting
+# in a segment is two blobs, kept in separate tables so boolean queries
+# never page through positions:
+#   postings.docs   uint32[]  sorted doc ids containing the term
+#   positions.keys  uint64[]  sorted (doc_id << 32 | position), for phrases
+# segments cover disjoint, ascending doc id ranges; whenever the newest
+# MERGE_FACTOR segments are of the same size tier they are merged (a
+# base-MERGE_FACTOR counter), so a term is spread over O(log n) rows and
+# its postings are read back sorted by plain concatenation. Removed /
+# replaced docs are tombstoned and dropped from postings when their
+# segment is next merged.
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "ats_analyzer", "keyword_index.sqlite3"
+)
+SKILL_PREFIX = "skill:"
+MERGE_FACTOR = 8
+MAX_SEGMENTS = 64
+PAGE_SIZE = 65536   # posting blobs are large: fewer overflow pages per read
+
+OPERATORS = ("AND", "OR", "NOT")
+QUERY_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+POSITION_MASK = np.uint64(0xFFFFFFFF)
+
+def _text_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _postings(docs):
+    """
+    {term: (doc ids, position keys)} for [(doc_id, doc)], numpy encoded.
+    A skill hit is positioned at the first word it starts on or before.
+    """
+    matcher = get_taxonomy().matcher
+    keys = {}
+    for doc_id, doc in docs:
+        doc = as_doc(doc)
+        base = doc_id << 32
+        for pos, word in enumerate(doc.words):
+            keys.setdefault(word, []).append(base | pos)
+
+        hits = matcher.find_doc(doc)
+        if hits:
+            starts = [m.start() for m in WORD_PATTERN.finditer(doc.lower)]
+            for skill, spans in hits.items():
+                found = keys.setdefault(SKILL_PREFIX + skill, [])
+                for start, _ in spans:
+                    found.append(base | bisect.bisect_left(starts, start))
+
+    out = {}
+    for term, found in keys.items():
+        found = np.asarray(found, dtype="<u8")
+        out[term] = (np.unique(found >> np.uint64(32)).astype("<u4"), found)
+    return out
+
+# ================= QUERY PARSER =================
+# expr  := conj (OR conj)*
+# conj  := unary ([AND] unary)*          adjacent terms are ANDed
+# unary := NOT unary | '(' expr ')' | "phrase" | term
+
+def query_words(text):
+    return WORD_PATTERN.findall(text.lower())
+
+def query_terms(text):
+    """
+    Index terms for one query word or quoted phrase: its words, or the
+    skill term when the words alone would lose it ("c++", "node.js").
+    """
+    words = query_words(text)
+    normalized = " ".join(text.lower().split())
+    if " ".join(words) != normalized:
+        skill = get_taxonomy().matcher.canonical.get(normalized)
+        if skill is not None:
+            return [SKILL_PREFIX + skill]
+    return words
+
+def parse_query(query):
+    """
+    Query string -> tree of ("term", w) / ("phrase", [w, ...]) /
+    ("and", [...]) / ("or", [...]) / ("not", node). Raises ValueError.
+    """
+    tokens = []
+    pos = 0
+    query = query.strip()
+    while pos < len(query):
+        m = QUERY_TOKEN.match(query, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"cannot parse query near: {query[pos:]!r}")
+        pos = m.end()
+        if m.group(1):
+            tokens.append(("(", None))
+        elif m.group(2):
+            tokens.append((")", None))
+        elif m.group(3) is not None:
+            tokens.append(("phrase", m.group(3)))
+        elif m.group(4) in OPERATORS:
+            tokens.append((m.group(4), None))
+        else:
+            tokens.append(("word", m.group(4)))
+
+    tokens.append(("end", None))
+    pos = 0
+
+    def peek():
+        return tokens[pos][0]
+
+    def take(kind):
+        nonlocal pos
+        if tokens[pos][0] != kind:
+            raise ValueError(f"expected {kind!r} in query")
+        pos += 1
+        return tokens[pos - 1][1]
+
+    def words_node(text):
+        words = query_terms(text)
+        if not words:
+            raise ValueError(f"{text!r} has no indexable words (3+ letters) or skills")
+        return ("term", words[0]) if len(words) == 1 else ("phrase", words)
+
+    def expr():
+        parts = [conj()]
+        while peek() == "OR":
+            take("OR")
+            parts.append(conj())
+        return parts[0] if len(parts) == 1 else ("or", parts)
+
+    def conj():
+        parts = [unary()]
+        while peek() in ("AND", "NOT", "(", "phrase", "word"):
+            if peek() == "AND":
+                take("AND")
+            parts.append(unary())
+        return parts[0] if len(parts) == 1 else ("and", parts)
+
+    def unary():
+        kind = peek()
+        if kind == "NOT":
+            take("NOT")
+            return ("not", unary())
+        if kind == "(":
+            take("(")
+            node = expr()
+            take(")")
+            return node
+        if kind in ("phrase", "word"):
+            return words_node(take(kind))
+        if kind == "end":
+            raise ValueError("query ends unexpectedly" if pos else "query is empty")
+        raise ValueError(f"unexpected {kind!r} in query")
+
+    node = expr()
+    if peek() != "end":
+        raise ValueError(f"unexpected {peek()!r} in query")
+    return node
+
+# ================= SORTED-ARRAY SET OPS =================
+
+def _member(a, b):
+    """
+    Mask of the values of `a` present in sorted `b`.
+    """
+    if not b.size:
+        return np.zeros(a.size, dtype=bool)
+    at = np.searchsorted(b, a)
+    at[at == b.size] = 0
+    return b[at] == a
+
+def _intersect(a, b):
+    if a.size > b.size:
+        a, b = b, a
+    return a[_member(a, b)]
+
+def _difference(a, b):
+    if not a.size or not b.size:
+        return a
+    return a[~_member(a, b)]
+
+def _concat_runs(blobs, dtype):
+    # one sorted run per segment; ranges are disjoint, so order runs by
+    # their first value and concatenate
+    runs = [r for r in (np.frombuffer(b, dtype=dtype) for b in blobs) if r.size]
+    if not runs:
+        return np.zeros(0, dtype=dtype)
+    if len(runs) == 1:
+        return runs[0]
+    runs.sort(key=lambda r: r[0])
+    return np.concatenate(runs)
+
+# ================= INDEX =================
+
+class KeywordIndex:
+    """
+    On-disk positional inverted index (SQLite) over cleaned resume text.
+    One connection per call, so it is safe across threads and processes.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or DEFAULT_INDEX_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        with self._db() as db:
+            db.execute(f"PRAGMA page_size={PAGE_SIZE}")   # only takes effect on a new file
+            db.execute("PRAGMA journal_mode=WAL")
+            # live: 1 searchable, 0 tombstoned (still in postings), -1 purged
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS docs (
+                    doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    candidate_id TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    live INTEGER NOT NULL,
+                    added REAL NOT NULL
+                )
+            """)
+            db.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS docs_live "
+                "ON docs (candidate_id) WHERE live = 1"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS docs_dead ON docs (doc_id) WHERE live = 0")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS segments (
+                    segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    first_doc INTEGER NOT NULL,
+                    n_docs INTEGER NOT NULL,
+                    docs BLOB NOT NULL
+                )
+            """)
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    segment_id INTEGER NOT NULL,
+                    docs BLOB NOT NULL,
+                    PRIMARY KEY (term, segment_id)
+                )
+            """)
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS positions (
+                    term TEXT NOT NULL,
+                    segment_id INTEGER NOT NULL,
+                    keys BLOB NOT NULL,
+                    PRIMARY KEY (term, segment_id)
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS postings_segment ON postings (segment_id)")
+            db.execute("CREATE INDEX IF NOT EXISTS positions_segment ON positions (segment_id)")
+
+    @contextmanager
+    def _db(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def __len__(self):
+        with self._db() as db:
+            return db.execute("SELECT COUNT(*) FROM docs WHERE live = 1").fetchone()[0]
+
+    def stats(self):
+        with self._db() as db:
+            return {
+                "docs": db.execute("SELECT COUNT(*) FROM docs WHERE live = 1").fetchone()[0],
+                "tombstones": db.execute("SELECT COUNT(*) FROM docs WHERE live = 0").fetchone()[0],
+                "segments": db.execute("SELECT COUNT(*) FROM segments").fetchone()[0],
+                "terms": db.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0],
+            }
+
+    # ---------------- writes ----------------
+
+    def add_texts(self, ids, texts, labels=None):
+        """
+        Upserts cleaned resumes as one new segment. Unchanged text for an
+        existing candidate is skipped; changed text replaces the old doc.
+        Returns the number of docs written.
+        """
+        ids = list(ids)
+        texts = list(texts)
+        labels = list(labels) if labels is not None else ids
+        if not ids:
+            return 0
+
+        with self._db() as db:
+            db.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            new_docs = []
+            for cid, text, label in zip(ids, texts, labels):
+                digest = _text_digest(text)
+                old = db.execute(
+                    "SELECT doc_id, digest FROM docs WHERE candidate_id = ? AND live = 1", (cid,)
+                ).fetchone()
+                if old and old[1] == digest:
+                    continue
+                if old:
+                    db.execute("UPDATE docs SET live = 0 WHERE doc_id = ?", (old[0],))
+                doc_id = db.execute(
+                    "INSERT INTO docs (candidate_id, label, digest, live, added) "
+                    "VALUES (?, ?, ?, 1, ?)",
+                    (cid, label, digest, now)
+                ).lastrowid
+                new_docs.append((doc_id, text))
+
+            if not new_docs:
+                return 0
+
+            doc_ids = np.asarray([d for d, _ in new_docs], dtype="<u4")
+            segment_id = db.execute(
+                "INSERT INTO segments (first_doc, n_docs, docs) VALUES (?, ?, ?)",
+                (int(doc_ids[0]), len(new_docs), doc_ids.tobytes())
+            ).lastrowid
+            postings = _postings(new_docs)
+            db.executemany(
+                "INSERT INTO postings VALUES (?, ?, ?)",
+                [(term, segment_id, docs.tobytes()) for term, (docs, _) in postings.items()]
+            )
+            db.executemany(
+                "INSERT INTO positions VALUES (?, ?, ?)",
+                [(term, segment_id, keys.tobytes()) for term, (_, keys) in postings.items()]
+            )
+            self._merge_tiers(db)
+        return len(new_docs)
+
+    def remove(self, ids):
+        with self._db() as db:
+            db.executemany(
+                "UPDATE docs SET live = 0 WHERE candidate_id = ? AND live = 1",
+                [(cid,) for cid in ids]
+            )
+
+    def compact(self):
+        """
+        Merges every segment into one, dropping tombstoned docs from postings.
+        """
+        with self._db() as db:
+            db.execute("BEGIN IMMEDIATE")
+            segment_ids = [s for (s,) in db.execute("SELECT segment_id FROM segments")]
+            if len(segment_ids) > 1 or (segment_ids and self._dead(db).size):
+                self._merge(db, segment_ids)
+
+    def _merge_tiers(self, db):
+        # only ever merges adjacent segments, so doc ranges stay contiguous
+        def tier(n_docs):
+            t = 0
+            while n_docs >= MERGE_FACTOR:
+                n_docs //= MERGE_FACTOR
+                t += 1
+            return t
+
+        while True:
+            segments = db.execute(
+                "SELECT segment_id, n_docs FROM segments ORDER BY first_doc"
+            ).fetchall()
+            newest = segments[-MERGE_FACTOR:]
+            tiers = {tier(n) for _, n in newest}
+            if len(newest) == MERGE_FACTOR and len(tiers) == 1:
+                run = newest
+            elif len(segments) > MAX_SEGMENTS:
+                # odd batch sizes can strand small segments: merge the lightest run
+                start = min(
+                    range(len(segments) - MERGE_FACTOR + 1),
+                    key=lambda i: sum(n for _, n in segments[i:i + MERGE_FACTOR])
+                )
+                run = segments[start:start + MERGE_FACTOR]
+            else:
+                return
+            self._merge(db, [segment_id for segment_id, _ in run])
+
+    def _merge(self, db, segment_ids):
+        marks = ",".join("?" * len(segment_ids))
+        dead = self._dead(db)
+
+        members = _concat_runs(
+            [d for (d,) in db.execute(
+                f"SELECT docs FROM segments WHERE segment_id IN ({marks})", segment_ids
+            )],
+            "<u4"
+        )
+        purged = _intersect(dead, members)
+        members = _difference(members, purged)
+        first_doc = db.execute(
+            f"SELECT MIN(first_doc) FROM segments WHERE segment_id IN ({marks})", segment_ids
+        ).fetchone()[0]
+        merged = db.execute(
+            "INSERT INTO segments (first_doc, n_docs, docs) VALUES (?, ?, ?)",
+            (first_doc, int(members.size), members.tobytes())
+        ).lastrowid
+
+        terms = [
+            t for (t,) in db.execute(
+                f"SELECT DISTINCT term FROM postings WHERE segment_id IN ({marks})", segment_ids
+            )
+        ]
+        for term in terms:
+            args = [term, *segment_ids]
+            docs = _concat_runs(
+                [d for (d,) in db.execute(
+                    f"SELECT docs FROM postings WHERE term = ? AND segment_id IN ({marks})", args
+                )],
+                "<u4"
+            )
+            docs = _difference(docs, purged)
+            if not docs.size:
+                continue
+            keys = _concat_runs(
+                [k for (k,) in db.execute(
+                    f"SELECT keys FROM positions WHERE term = ? AND segment_id IN ({marks})", args
+                )],
+                "<u8"
+            )
+            if purged.size:
+                keys = keys[_member((keys >> np.uint64(32)).astype("<u4"), docs)]
+            db.execute("INSERT INTO postings VALUES (?, ?, ?)", (term, merged, docs.tobytes()))
+            db.execute("INSERT INTO positions VALUES (?, ?, ?)", (term, merged, keys.tobytes()))
+
+        db.execute(f"DELETE FROM postings WHERE segment_id IN ({marks})", segment_ids)
+        db.execute(f"DELETE FROM positions WHERE segment_id IN ({marks})", segment_ids)
+        db.execute(f"DELETE FROM segments WHERE segment_id IN ({marks})", segment_ids)
+        db.executemany(
+            "UPDATE docs SET live = -1 WHERE doc_id = ?", [(d,) for d in purged.tolist()]
+        )
+
+    # ---------------- reads ----------------
+
+    def _dead(self, db):
+        return np.fromiter(
+            (d for (d,) in db.execute("SELECT doc_id FROM docs WHERE live = 0 ORDER BY doc_id")),
+            dtype="<u4"
+        )
+
+    @timed("keyword_query")
+    def match(self, query):
+        """
+        Sorted doc ids of live resumes matching a query string (or parsed tree).
+        """
+        node = parse_query(query) if isinstance(query, str) else query
+        with self._db() as db:
+            hits = _QueryRun(db).evaluate(node)
+            hits[self._dead(db)] = False
+        return np.flatnonzero(hits).astype("<u4")
+
+    def search(self, query, limit=20):
+        """
+        (total matches, [(candidate_id, label)] newest first, up to `limit`).
+        """
+        doc_ids = self.match(query)
+        newest = doc_ids[::-1][:limit].tolist()
+        if not newest:
+            return int(doc_ids.size), []
+
+        with self._db() as db:
+            found = {
+                doc_id: (cid, label)
+                for doc_id, cid, label in db.execute(
+                    f"SELECT doc_id, candidate_id, label FROM docs "
+                    f"WHERE doc_id IN ({','.join('?' * len(newest))})",
+                    newest
+                )
+            }
+        return int(doc_ids.size), [found[d] for d in newest if d in found]
+
+class _QueryRun:
+    """
+    Evaluates one parsed query against a connection as boolean masks over
+    doc ids (AND / OR / NOT are then single vector ops); each term's
+    postings are read at most once.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.size = (db.execute("SELECT MAX(doc_id) FROM docs").fetchone()[0] or 0) + 1
+        self._docs = {}
+        self._keys = {}
+        self._universe = None
+
+    def docs(self, term):
+        found = self._docs.get(term)
+        if found is None:
+            found = self._docs[term] = _concat_runs(
+                [d for (d,) in self.db.execute("SELECT docs FROM postings WHERE term = ?", (term,))],
+                "<u4"
+            )
+        return found
+
+    def keys(self, term):
+        found = self._keys.get(term)
+        if found is None:
+            found = self._keys[term] = _concat_runs(
+                [k for (k,) in self.db.execute("SELECT keys FROM positions WHERE term = ?", (term,))],
+                "<u8"
+            )
+        return found
+
+    def mask(self, doc_ids):
+        out = np.zeros(self.size, dtype=bool)
+        out[doc_ids] = True
+        return out
+
+    def universe(self):
+        if self._universe is None:
+            self._universe = self.mask(
+                _concat_runs([d for (d,) in self.db.execute("SELECT docs FROM segments")], "<u4")
+            )
+        return self._universe
+
+    def phrase(self, words):
+        # docs holding every word first; then start positions of the word
+        # with the fewest occurrences in those docs, probed against each
+        # other word's positions
+        candidates = self.mask(self.docs(words[0]))
+        for word in words[1:]:
+            candidates &= self.mask(self.docs(word))
+        if not candidates.any():
+            return candidates
+
+        by_size = sorted(range(len(words)), key=lambda i: self.keys(words[i]).size)
+        anchor = by_size[0]
+        starts = self.keys(words[anchor])
+        starts = starts[candidates[starts >> np.uint64(32)]]
+        starts = starts[(starts & POSITION_MASK) >= anchor] - np.uint64(anchor)
+        for i in by_size[1:]:
+            starts = starts[_member(starts + np.uint64(i), self.keys(words[i]))]
+        return self.mask(starts >> np.uint64(32))
+
+    def evaluate(self, node):
+        """
+        Fresh boolean mask (indexed by doc id) of the docs matching `node`.
+        """
+        kind, arg = node
+        if kind == "term":
+            return self.mask(self.docs(arg))
+        if kind == "phrase":
+            return self.phrase(arg)
+        if kind == "or":
+            out = self.evaluate(arg[0])
+            for child in arg[1:]:
+                out |= self.evaluate(child)
+            return out
+        if kind == "not":
+            return self.universe() & ~self.evaluate(arg)
+
+        include = [c for c in arg if c[0] != "not"]
+        exclude = [c[1] for c in arg if c[0] == "not"]
+        out = self.evaluate(include[0]) if include else self.universe().copy()
+        for child in include[1:]:
+            out &= self.evaluate(child)
+        for child in exclude:
+            out &= ~self.evaluate(child)
+        return out
+
+# ================= CLI =================
+
+def index_batch(index, batch):
+    """
+    Adds [(candidate_id, cleaned text)] with file names as labels.
+    """
+    if not batch:
+        return 0
+    ids = [cid for cid, _ in batch]
+    return index.add_texts(ids, [t for _, t in batch], [os.path.basename(i) for i in ids])
+
+def print_search(index, query, limit):
+    """
+    Runs a query for a CLI: hits on stdout, count and latency on stderr.
+    Returns the exit code (2 for a malformed query).
+    """
+    start = time.perf_counter()
+    try:
+        total, hits = index.search(query, limit)
+    except ValueError as e:
+        print("QUERY ERROR:", e, file=sys.stderr)
+        return 2
+    took = (time.perf_counter() - start) * 1000
+    for cid, label in hits:
+        print(f"{label}  ({cid})")
+    print(f"{total} matches in {took:.1f} ms", file=sys.stderr)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Boolean / phrase keyword search over resumes.")
+    parser.add_argument("--index", help="index file (default: ~/.cache/ats_analyzer)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="index or re-index resumes")
+    add.add_argument("--resumes", help="directory of PDF / DOCX / TXT resumes")
+    add.add_argument("--manifest", help="file listing one resume path per line")
+    add.add_argument("--workers", type=int, help="extraction processes")
+    add.add_argument("--batch-size", type=int, default=1000, help="resumes per segment")
+
+    remove = sub.add_parser("remove", help="remove candidates by id (file path)")
+    remove.add_argument("ids", nargs="+")
+
+    query = sub.add_parser("query", help='e.g. python AND (django OR flask) AND NOT intern')
+    query.add_argument("query")
+    query.add_argument("-n", type=int, default=20, help="matches to list")
+
+    sub.add_parser("compact", help="merge all segments, purge removed resumes")
+    sub.add_parser("stats")
+
+    args = parser.parse_args(argv)
+    index = KeywordIndex(args.index)
+
+    if args.command == "add":
+        from batch_screen import collect_resume_paths, load_cleaned_resumes
+        from text_cache import TextCache
+
+        paths = collect_resume_paths(args.resumes, args.manifest)
+        batch, written, failed = [], 0, 0
+        for path, cleaned, err in load_cleaned_resumes(paths, TextCache(), args.workers):
+            if err:
+                failed += 1
+                print(f"skip {path}: {err}", file=sys.stderr)
+                continue
+            batch.append((os.path.abspath(path), cleaned))
+            if len(batch) >= args.batch_size:
+                written += index_batch(index, batch)
+                batch = []
+        written += index_batch(index, batch)
+        print(f"Indexed {written} resumes ({failed} failed), {len(index)} searchable", file=sys.stderr)
+
+    elif args.command == "remove":
+        index.remove(os.path.abspath(i) for i in args.ids)
+        print(f"{len(index)} searchable", file=sys.stderr)
+
+    elif args.command == "compact":
+        index.compact()
+        print(index.stats(), file=sys.stderr)
+
+    elif args.command == "stats":
+        print(index.stats())
+
+    else:
+        return print_search(index, args.query, args.n)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+
+# ================= ONNX RUNTIME ENCODER =================
+# all-MiniLM-L6-v2 without torch: the exported ONNX graph (fp32 or int8
+# quantized) run by onnxruntime, tokenized by the `tokenizers` library,
+# mean-pooled exactly like the SentenceTransformer pipeline
+
+ONNX_FILES = {
+    "onnx": "onnx/model.onnx",
+    "onnx-int8": "onnx/model_quint8_avx2.onnx",
+}
+MAX_SEQ_LENGTH = 256   # SentenceTransformer's limit for MiniLM
+
+class OnnxEncoder:
+    """
+    Drop-in for SentenceTransformer.encode() on CPU.
+    `model_file` is a file in the model's hub repo or a local .onnx path.
+    """
+
+    def __init__(self, model_name, model_file=None, threads=None):
+        import onnxruntime as ort
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        repo = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        model_file = model_file or ONNX_FILES["onnx"]
+        if not os.path.isfile(model_file):
+            model_file = hf_hub_download(repo, model_file)
+
+        self.tokenizer = Tokenizer.from_file(hf_hub_download(repo, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            model_file, options, providers=["CPUExecutionProvider"]
+        )
+        self.inputs = {i.name for i in self.session.get_inputs()}
+        outputs = [o.name for o in self.session.get_outputs()]
+        self.output = "last_hidden_state" if "last_hidden_state" in outputs else outputs[0]
+
+    def _embed(self, texts):
+        encoded = self.tokenizer.encode_batch(texts)
+        mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encoded], dtype=np.int64),
+            "attention_mask": mask,
+        }
+        if "token_type_ids" in self.inputs:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encoded], dtype=np.int64)
+
+        hidden = self.session.run([self.output], feeds)[0]
+        weights = mask[..., None].astype(np.float32)
+        return (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True,
+               normalize_embeddings=False, **_):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # similar lengths share a batch, so little padding is computed
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        out = None
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            embs = self._embed([texts[i] for i in batch])
+            if out is None:
+                out = np.zeros((len(texts), embs.shape[1]), dtype=np.float32)
+            out[batch] = embs
+
+        if normalize_embeddings:
+            out /= np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+        return out[0] if single else out
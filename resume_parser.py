@@ -1,13 +1,181 @@
-import pdfplumber
-from docx import Document
+import multiprocessing
+import signal
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 
+import stage_metrics
+from stage_metrics import span, timed
+
+try:
+    import resource
+except ImportError:  # Windows: no memory caps
+    resource = None
+
+@timed("extract_pdf")
 def extract_text_from_pdf(file):
+    import pdfplumber
+
     text = ""
     with pdfplumber.open(file) as pdf:
         for page in pdf.pages:
             text += page.extract_text() or ""
     return text
 
+@timed("extract_docx")
 def extract_text_from_docx(file):
+    from docx import Document
+
     doc = Document(file)
     return "\n".join([para.text for para in doc.paragraphs])
+
+# ================= PARALLEL INGESTION =================
+
+class IngestTimeout(Exception):
+    pass
+
+class ResumeParseError(Exception):
+    """
+    The file could not be read as a PDF / DOCX (malformed or not one).
+    """
+
+def pool_context():
+    """
+    Start method for pools created by a long-lived parent: workers forked
+    after torch is loaded inherit its threads and address space (then hit
+    the RLIMIT_AS cap), so start them from a clean forkserver instead.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def _init_worker(memory_mb):
+    # hard address-space cap: a runaway PDF raises MemoryError in its own worker
+    if memory_mb and resource is not None:
+        limit = int(memory_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _on_alarm(signum, frame):
+    raise IngestTimeout("extraction timed out")
+
+def _extract_unit(path, start, stop, timeout):
+    """
+    One unit of work: a page range of a PDF, or a whole DOCX / TXT file.
+    Returns (page_count or None, text, stage timings); the timings are
+    replayed by the parent, whose sinks this worker cannot reach.
+    """
+    with stage_metrics.capture(emit=False) as timings, span("extract"):
+        page_count, text = _extract_pages(path, start, stop, timeout)
+    return page_count, text, timings
+
+def _extract_pages(path, start, stop, timeout):
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        lower = path.lower()
+
+        if lower.endswith(".pdf"):
+            import pdfplumber
+
+            with span("extract_pdf"), pdfplumber.open(path) as pdf:
+                pages = pdf.pages
+                text = "".join(
+                    page.extract_text() or "" for page in pages[start:stop]
+                )
+                return len(pages), text
+
+        if lower.endswith(".docx"):
+            return None, extract_text_from_docx(path)
+
+        with open(path, encoding="utf-8", errors="ignore") as fh:
+            return None, fh.read()
+
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+def ingest_resumes(paths, workers=None, timeout=60, memory_mb=1024, pages_per_task=8):
+    """
+    Extracts text from many resumes on a process pool.
+
+    Yields (path, text, error) in completion order. Long PDFs are split
+    into page ranges once their page count is known. `timeout` (seconds)
+    and `memory_mb` apply to each unit of work, so one pathological file
+    fails on its own instead of stalling the batch.
+    """
+    paths = list(paths)
+    files = {}       # index -> {"chunks": {start: text}, "expected": n}
+    pending = {}     # future -> (index, start, attempt)
+    pool = None
+
+    def new_pool():
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=pool_context(),
+            initializer=_init_worker,
+            initargs=(memory_mb,)
+        )
+
+    def submit(index, start, attempt=0):
+        stop = start + pages_per_task
+        fut = pool.submit(_extract_unit, paths[index], start, stop, timeout)
+        pending[fut] = (index, start, attempt)
+
+    try:
+        pool = new_pool()
+        for i in range(len(paths)):
+            files[i] = {"chunks": {}, "expected": 1}
+            submit(i, 0)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for fut in done:
+                index, start, attempt = pending.pop(fut)
+                state = files.get(index)
+                if state is None:
+                    continue   # file already failed
+
+                try:
+                    page_count, text, timings = fut.result()
+
+                except BrokenProcessPool:
+                    # a worker died outright (e.g. killed by the OS);
+                    # the culprit is unknown, so retry everything in flight once
+                    retry = [(index, start, attempt)] + [
+                        pending.pop(f) for f in list(pending)
+                    ]
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = new_pool()
+                    for i, s, a in retry:
+                        if files.get(i) is None:
+                            continue
+                        if a >= 1:
+                            files[i] = None
+                            yield paths[i], "", "BrokenProcessPool: worker crashed"
+                        else:
+                            submit(i, s, a + 1)
+                    break
+
+                except Exception as e:
+                    files[index] = None
+                    yield paths[index], "", f"{type(e).__name__}: {e}"
+                    continue
+
+                stage_metrics.replay(timings)
+                state["chunks"][start] = text
+
+                if start == 0 and page_count and page_count > pages_per_task:
+                    for s in range(pages_per_task, page_count, pages_per_task):
+                        submit(index, s)
+                    state["expected"] = -(-page_count // pages_per_task)
+
+                if len(state["chunks"]) == state["expected"]:
+                    files[index] = None
+                    chunks = state["chunks"]
+                    yield paths[index], "".join(chunks[s] for s in sorted(chunks)), None
+
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
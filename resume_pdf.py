@@ -0,0 +1,453 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+)
+from functools import lru_cache
+
+from ats_engine import (
+    generate_ai_profile_summary,
+    extract_education_section,
+    extract_internship_section,
+    extract_experience_section,
+    extract_project_section,
+    is_real_experience,
+    is_candidate_experienced,
+)
+from resume_parser import pool_context
+from skill_taxonomy import get_taxonomy
+from stage_metrics import span, timed
+
+# reportlab is imported on first render, not at import time
+
+# --------------------------------------------------
+# PROCESS-WIDE TEMPLATE (styles built once)
+# --------------------------------------------------
+class ResumeTemplate:
+    """
+    Page geometry, paragraph styles and flowable classes shared by every
+    render in this process. Only the flowables are built per resume.
+    """
+
+    def __init__(self):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        from reportlab.lib.enums import TA_LEFT
+        from reportlab.lib.styles import ParagraphStyle
+
+        self.Paragraph = Paragraph
+        self.Spacer = Spacer
+        self._doc_class = SimpleDocTemplate
+        self.page = dict(
+            pagesize=A4,
+            rightMargin=40,
+            leftMargin=40,
+            topMargin=40,
+            bottomMargin=40
+        )
+
+        styles = getSampleStyleSheet()
+
+        styles.add(ParagraphStyle(
+            name="Name",
+            fontSize=20,
+            spaceAfter=8,
+            alignment=TA_LEFT,
+            leading=24,
+            fontName="Helvetica-Bold"   # 👈 makes it bold
+        ))
+
+        styles.add(ParagraphStyle(
+            name="Section",
+            fontSize=12,
+            spaceBefore=14,
+            spaceAfter=6,
+            leading=14,
+            fontName="Helvetica-Bold"
+        ))
+
+        styles.add(ParagraphStyle(
+            name="Body",
+            fontSize=10,
+            leading=14,
+            spaceAfter=6
+        ))
+
+        self.styles = styles
+
+    def doc(self, buffer):
+        # a doc template binds its output, so it is the one per-render object
+        return self._doc_class(buffer, **self.page)
+
+@lru_cache(maxsize=1)
+def get_template():
+    return ResumeTemplate()
+
+# --------------------------------------------------
+# PDF GENERATION 
+# --------------------------------------------------
+@timed("pdf")
+def generate_optimized_resume_pdf(details, matched, missing, resume, jd):
+    """
+    ATS-optimized resume PDF (bytes, or None on failure).
+    """
+    template = get_template()
+    content = build_resume_flowables(details, matched, missing, resume, jd, template)
+
+    buffer = io.BytesIO()
+    doc = template.doc(buffer)
+
+    # ---------- BUILD PDF (FINAL STEP) ----------
+    try:
+        with span("pdf_build"):
+            doc.build(content)
+
+        pdf_bytes = buffer.getvalue()   # ✅ convert to bytes
+        buffer.close()
+
+        return pdf_bytes
+
+    except Exception as e:
+        print("PDF ERROR:", e)
+        return None
+
+def build_resume_flowables(details, matched, missing, resume, jd, template=None):
+    """
+    The resume's flowables (paragraphs / spacers) for a template.
+    """
+    template = template or get_template()
+    Paragraph, Spacer, styles = template.Paragraph, template.Spacer, template.styles
+
+    content = []
+
+    # ---------- HEADER ----------
+    content.append(Paragraph(details["name"].upper(), styles["Name"]))
+
+    linkedin_display = details['linkedin'].replace("https://","").replace("http://","")
+    github_display = details['github'].replace("https://","").replace("http://","")
+
+    # ---------- CLICKABLE LINKS ----------
+    def make_clickable(url):
+        if url and "not found" not in url.lower():
+            return f'<link href="{url}" color="blue">{url.replace("https://","").replace("http://","")}</link>'
+        return ""
+
+    linkedin_link = make_clickable(details["linkedin"])
+    github_link = make_clickable(details["github"])
+    portfolio_link = make_clickable(details["portfolio"])
+
+    contact_line = f"""
+    {details['email']} | {details['phone']}<br/>
+    LinkedIn: {linkedin_link}<br/>
+    GitHub: {github_link}<br/>
+    Portfolio: {portfolio_link}
+    """
+
+    content.append(Paragraph(contact_line, styles["Body"]))
+
+    content.append(Spacer(1, 10))
+
+
+    # ---------- SUMMARY ----------
+    content.append(Paragraph("PROFESSIONAL SUMMARY", styles["Section"]))
+    content.append(Paragraph(
+        generate_ai_profile_summary(details, matched, jd),
+        styles["Body"]
+    ))
+    
+    #---------- EDUCATION ---------
+    education_data = extract_education_section(resume)
+
+    if education_data:
+        content.append(Paragraph("EDUCATION", styles["Section"]))
+
+        for edu in education_data:
+
+            degree_line = f"<b>{edu['degree']}</b>"
+
+            if edu['year']:
+                degree_line += f" ({edu['year']})"
+
+            if edu.get('pursuing', False) and "pursuing" not in degree_line.lower():
+                degree_line += edu['pursuing']
+
+            content.append(Paragraph(degree_line, styles["Body"]))
+
+            if edu['institution']:
+                content.append(Paragraph(edu['institution'], styles["Body"]))
+
+            if edu['cgpa']:
+                content.append(Paragraph(edu['cgpa'], styles["Body"]))
+
+            content.append(Spacer(1,8))
+
+    # ---------- INTERNSHIP ----------
+    internship_data = extract_internship_section(resume)
+
+    if internship_data:
+        content.append(Paragraph("INTERNSHIP EXPERIENCE", styles["Section"]))
+
+        for intern in internship_data:
+
+            # ✅ TITLE (always show)
+            if intern.get("title"):
+                content.append(
+                    Paragraph(f"<b>{intern['title']}</b>", styles["Body"])
+                )
+
+            # ✅ DURATION (show only if exists)
+            if intern.get("duration"):
+                content.append(
+                    Paragraph(intern["duration"], styles["Body"])
+                )
+
+            # ✅ DESCRIPTION (safe check)
+            if intern.get("description"):
+                content.append(
+                    Paragraph(intern["description"], styles["Body"])
+                )
+
+            content.append(Spacer(1, 8))
+            
+    # ---------- EXPERIENCE (SMART ATS FILTER) ----------
+    experience_data = extract_experience_section(resume)
+
+    # show only if REAL job experience exists
+    if experience_data and is_candidate_experienced(experience_data):
+
+        content.append(Paragraph("EXPERIENCE", styles["Section"]))
+
+        for exp in experience_data:
+
+            # skip fake or internship-like entries
+            if not is_real_experience(exp):
+                continue
+
+            if exp.get("title"):
+                content.append(
+                    Paragraph(f"<b>{exp['title']}</b>", styles["Body"])
+                )
+
+            if exp.get("duration"):
+                content.append(
+                    Paragraph(exp["duration"], styles["Body"])
+                )
+
+            if exp.get("description"):
+                content.append(
+                    Paragraph(exp["description"], styles["Body"])
+                )
+
+            content.append(Spacer(1,8))
+             
+    # ---------- PROJECTS ----------
+    project_data = extract_project_section(resume)
+
+    if project_data:
+        content.append(Paragraph("PROJECTS", styles["Section"]))
+
+        for project in project_data:
+
+            content.append(
+                Paragraph(f"<b>{project['title']}</b>", styles["Body"])
+            )
+
+            if project['description']:
+                content.append(
+                    Paragraph(project['description'], styles["Body"])
+            )
+
+            if project['technologies']:
+                content.append(
+                    Paragraph(project['technologies'], styles["Body"])
+                )
+
+            content.append(Spacer(1,8))
+ 
+    # ---------- CORE SKILLS ----------
+    content.append(Paragraph("CORE SKILLS", styles["Section"]))
+
+    if matched:
+        # categories come from the shared skill taxonomy
+        taxonomy = get_taxonomy()
+        skill_lines = [
+            f"• {category}: {', '.join([s for s in matched if taxonomy.category.get(s) == category])}"
+            for category in taxonomy.by_category
+        ]
+        for line in skill_lines:
+            if ":" in line and line.split(":")[1].strip():
+                content.append(Paragraph(line, styles["Body"]))
+    else:
+        content.append(Paragraph("Python, SQL, Git", styles["Body"]))
+
+    return content
+
+# --------------------------------------------------
+# CACHED / BACKGROUND RENDERING
+# --------------------------------------------------
+
+# bump whenever the PDF layout changes (invalidates cached bytes)
+PDF_VERSION = 1
+PDF_CACHE_ENTRIES = 128
+PDF_CACHE_BYTES = 64 * 1024 * 1024
+
+def pdf_cache_key(details, matched, missing, resume, jd):
+    """
+    sha256 of everything the PDF is rendered from.
+    """
+    payload = json.dumps(
+        [PDF_VERSION, get_taxonomy().digest, details, list(matched), list(missing), resume, jd],
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class PdfCache:
+    """
+    Thread-safe in-memory LRU of rendered PDFs, bounded by entry count
+    and total bytes.
+    """
+
+    def __init__(self, max_entries=PDF_CACHE_ENTRIES, max_bytes=PDF_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pdf = self._entries.get(key)
+            if pdf is not None:
+                self._entries.move_to_end(key)
+            return pdf
+
+    def put(self, key, pdf):
+        if not pdf or len(pdf) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = pdf
+            self._bytes += len(pdf)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+_default_cache = PdfCache()
+
+def cached_optimized_resume_pdf(details, matched, missing, resume, jd, cache=None):
+    """
+    generate_optimized_resume_pdf, reusing bytes rendered for identical inputs.
+    """
+    cache = cache or _default_cache
+    key = pdf_cache_key(details, matched, missing, resume, jd)
+    pdf = cache.get(key)
+    if pdf is None:
+        pdf = generate_optimized_resume_pdf(details, matched, missing, resume, jd)
+        cache.put(key, pdf)
+    return pdf
+
+class PdfRenderer:
+    """
+    Renders PDFs on background threads, off the request / script thread.
+    Identical inputs share one cached result and one in-flight render.
+    """
+
+    def __init__(self, workers=1, cache=None):
+        self.cache = cache or _default_cache
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="pdf")
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def cached(self, details, matched, missing, resume, jd):
+        """
+        Bytes if this PDF was already rendered, else None (never renders).
+        """
+        return self.cache.get(pdf_cache_key(details, matched, missing, resume, jd))
+
+    def submit(self, details, matched, missing, resume, jd):
+        """
+        Future of the PDF bytes (None if rendering failed).
+        """
+        key = pdf_cache_key(details, matched, missing, resume, jd)
+        pdf = self.cache.get(key)
+        if pdf is not None:
+            done = Future()
+            done.set_result(pdf)
+            return done
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._pool.submit(
+                    self._render, key, details, matched, missing, resume, jd
+                )
+                self._inflight[key] = future
+            return future
+
+    def _render(self, key, details, matched, missing, resume, jd):
+        try:
+            pdf = generate_optimized_resume_pdf(details, matched, missing, resume, jd)
+            self.cache.put(key, pdf)
+            return pdf
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+# --------------------------------------------------
+# BULK RENDERING (process pool -> ZIP)
+# --------------------------------------------------
+def _render_candidate(arcname, resume, jd):
+    from ats_engine import extract_user_details, skill_gap
+
+    details = extract_user_details(resume)
+    matched, missing = skill_gap(resume, jd)
+    return arcname, generate_optimized_resume_pdf(details, matched, missing, resume, jd)
+
+def render_pdfs_to_zip(candidates, jd, out, workers=None):
+    """
+    Renders one tailored PDF per (arcname, cleaned resume) in a process
+    pool and writes each into the ZIP `out` (path or binary file object)
+    as soon as it is ready. Returns (written, failed arcnames).
+    """
+    candidates = iter(candidates)
+    workers = workers or os.cpu_count() or 1
+    written, failed = 0, []
+
+    # batch_screen --semantic has torch loaded in this process by now
+    with ProcessPoolExecutor(workers, mp_context=pool_context()) as pool, \
+            zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        pending = {}
+
+        def refill():
+            # bounded in-flight work: results are never all held in memory
+            for arcname, resume in candidates:
+                pending[pool.submit(_render_candidate, arcname, resume, jd)] = arcname
+                if len(pending) >= workers * 2:
+                    return
+
+        refill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                arcname = pending.pop(future)
+                try:
+                    _, pdf = future.result()
+                except Exception as e:
+                    print("PDF ERROR:", e)
+                    pdf = None
+                if pdf:
+                    archive.writestr(arcname, pdf)
+                    written += 1
+                else:
+                    failed.append(arcname)
+            refill()
+
+    return written, failed
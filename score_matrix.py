@@ -0,0 +1,244 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from doc_tokens import TokenizedDoc, as_doc
+from skill_taxonomy import get_taxonomy
+from stage_metrics import span
+
+# ================= MANY RESUMES x MANY JDS =================
+# python score_matrix.py --jds ./openings --resumes ./applicants --out ./fair --top 3
+#
+# every applicant against every opening in one pass: resumes and JDs
+# become sparse 0/1 incidence rows (JD words, taxonomy skills), and each
+# block of BLOCK_ROWS resumes is scored against all JDs with one matrix
+# product per measure. Only one block is ever densified, so memory stays
+# flat whatever the number of resumes.
+#
+# ats    = ats_score() in overlap mode, exactly
+# skills = how many of the JD's taxonomy skills the resume has (skill_gap
+#          without the top-10 cut)
+# semantic = semantic_match_scores() (whole-document MiniLM cosine x 100)
+
+BLOCK_ROWS = 1024
+
+def incidence(docs, columns, features):
+    """
+    CSR (indptr, indices) of which `columns` each doc has; `features`
+    maps a TokenizedDoc to the keys it contains.
+    """
+    indptr = [0]
+    indices = []
+    for doc in docs:
+        indices.extend(columns[k] for k in features(doc) if k in columns)
+        indptr.append(len(indices))
+    return np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int32)
+
+def densify(indptr, indices, n_cols, dtype=np.float32):
+    out = np.zeros((len(indptr) - 1, n_cols), dtype=dtype)
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    out[rows, indices] = 1
+    return out
+
+def _words(doc):
+    return doc.word_set()
+
+def _skills(doc):
+    return get_taxonomy().matcher.find_doc(doc)
+
+class JdMatrix:
+    """
+    The JD side, built once: word and skill incidence (features x JDs),
+    per-JD totals and, optionally, the JD embeddings. Those are encoded
+    on the first score() call, so the model is not loaded in a parent
+    that forks extraction workers before scoring starts.
+    """
+
+    def __init__(self, jds, semantic=False):
+        self.jds = [as_doc(jd) for jd in jds]
+
+        vocab = sorted(set().union(*(jd.word_set() for jd in self.jds))) if self.jds else []
+        self.word_columns = {w: i for i, w in enumerate(vocab)}
+        self.skill_columns = {s: i for i, s in enumerate(get_taxonomy().skills)}
+
+        words = densify(*incidence(self.jds, self.word_columns, _words), len(vocab))
+        skills = densify(*incidence(self.jds, self.skill_columns, _skills), len(self.skill_columns))
+        self.words = np.ascontiguousarray(words.T)       # vocab x JDs
+        self.skills = np.ascontiguousarray(skills.T)     # skills x JDs
+        self.word_totals = np.maximum(1, words.sum(axis=1)).astype(np.float64)
+        self.skill_totals = skills.sum(axis=1).astype(np.int64)
+
+        self.semantic = semantic
+        self._embeddings = None
+
+    def __len__(self):
+        return len(self.jds)
+
+    @property
+    def embeddings(self):
+        if self.semantic and self._embeddings is None:
+            from ai_matcher import jd_embedding
+            self._embeddings = np.stack([jd_embedding(jd) for jd in self.jds])
+        return self._embeddings
+
+    def score(self, resumes, batch_size=64):
+        """
+        {"ats", "skills", "semantic"} matrices (resumes x JDs) for one block.
+        """
+        docs = [r if isinstance(r, TokenizedDoc) else TokenizedDoc(r) for r in resumes]
+        out = {}
+
+        with span("matrix.ats"):
+            block = densify(*incidence(docs, self.word_columns, _words), len(self.word_columns))
+            ratio = (block @ self.words) / self.word_totals
+            out["ats"] = np.round(np.minimum(98, 35 + ratio * 65)).astype(np.uint8)
+
+        with span("matrix.skills"):
+            block = densify(*incidence(docs, self.skill_columns, _skills), len(self.skill_columns))
+            out["skills"] = np.rint(block @ self.skills).astype(np.uint16)
+
+        if self.semantic:
+            from ai_matcher import encode_texts
+            with span("matrix.semantic"):
+                vectors = encode_texts([d.text for d in docs], batch_size)
+                out["semantic"] = np.round(vectors @ self.embeddings.T * 100, 2).astype(np.float32)
+        return out
+
+    def skill_match(self, matched):
+        """
+        Matched-skill counts -> percent of each JD's required skills.
+        """
+        return np.round(matched * 100 / np.maximum(1, self.skill_totals)).astype(np.uint8)
+
+def score_blocks(jd_matrix, resumes, block_rows=BLOCK_ROWS, batch_size=64):
+    """
+    Streams (first row, block matrices) over an iterable of resume texts.
+    """
+    block = []
+    start = 0
+    for resume in resumes:
+        block.append(resume)
+        if len(block) >= block_rows:
+            yield start, jd_matrix.score(block, batch_size)
+            start += len(block)
+            block = []
+    if block:
+        yield start, jd_matrix.score(block, batch_size)
+
+# ================= CLI =================
+
+def _jd_paths(jd_dir):
+    return sorted(
+        os.path.join(jd_dir, f) for f in os.listdir(jd_dir)
+        if f.endswith((".txt", ".json"))
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score every resume against every JD.")
+    parser.add_argument("--jds", required=True, help="directory of JD .txt files / compiled profiles")
+    parser.add_argument("--resumes", help="directory of PDF / DOCX / TXT resumes")
+    parser.add_argument("--manifest", help="file listing one resume path per line")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--top", type=int, default=3, help="best openings per applicant in top.csv")
+    parser.add_argument("--semantic", action="store_true", help="add MiniLM semantic scores")
+    parser.add_argument("--block-rows", type=int, default=BLOCK_ROWS, help="resumes per block")
+    parser.add_argument("--batch-size", type=int, default=64, help="resumes per encode batch")
+    parser.add_argument("--workers", type=int, help="extraction processes")
+    parser.add_argument("--cache", help="text cache file (default: ~/.cache/ats_analyzer)")
+    parser.add_argument("--no-cache", action="store_true", help="always re-extract every file")
+    args = parser.parse_args(argv)
+
+    if not args.resumes and not args.manifest:
+        print("error: pass --resumes and/or --manifest", file=sys.stderr)
+        return 2
+
+    from batch_screen import collect_resume_paths, load_cleaned_resumes
+    from job_profile import load_job
+
+    jd_paths = _jd_paths(args.jds)
+    if not jd_paths:
+        print(f"error: no JDs in {args.jds}", file=sys.stderr)
+        return 2
+    jds = JdMatrix([load_job(p) for p in jd_paths], semantic=args.semantic)
+
+    cache = None
+    if not args.no_cache:
+        from text_cache import TextCache
+        cache = TextCache(args.cache)
+
+    paths = collect_resume_paths(args.resumes, args.manifest)
+    os.makedirs(args.out, exist_ok=True)
+
+    # results land in .npy files on disk, one block of rows at a time
+    shape = (len(paths), len(jds))
+    matrices = {
+        "ats": np.lib.format.open_memmap(
+            os.path.join(args.out, "ats.npy"), "w+", np.uint8, shape),
+        "skills": np.lib.format.open_memmap(
+            os.path.join(args.out, "skills.npy"), "w+", np.uint16, shape),
+    }
+    if args.semantic:
+        matrices["semantic"] = np.lib.format.open_memmap(
+            os.path.join(args.out, "semantic.npy"), "w+", np.float32, shape)
+
+    rows = []          # (path, error) in matrix row order
+    ok_rows = []
+
+    def texts():
+        for path, cleaned, err in load_cleaned_resumes(paths, cache, args.workers):
+            rows.append((path, err))
+            if err:
+                print(f"skip {path}: {err}", file=sys.stderr)
+                continue
+            ok_rows.append(len(rows) - 1)
+            yield cleaned
+
+    fields = ["file", "rank", "jd", "ats_score", "skill_match", "semantic_score"]
+    with open(os.path.join(args.out, "top.csv"), "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=fields)
+        writer.writeheader()
+
+        for start, block in score_blocks(jds, texts(), args.block_rows, args.batch_size):
+            at = ok_rows[start:start + len(block["ats"])]
+            for name, values in block.items():
+                matrices[name][at] = values
+
+            # rank openings by semantic score when present, else ATS score
+            key = block.get("semantic", block["ats"]).astype(np.float32)
+            k = min(args.top, len(jds))
+            best = np.argsort(-key, axis=1, kind="stable")[:, :k]
+            match = jds.skill_match(block["skills"])
+            for i, row in enumerate(at):
+                for rank, j in enumerate(best[i], 1):
+                    writer.writerow({
+                        "file": rows[row][0],
+                        "rank": rank,
+                        "jd": os.path.basename(jd_paths[j]),
+                        "ats_score": int(block["ats"][i, j]),
+                        "skill_match": int(match[i, j]),
+                        "semantic_score": round(float(block["semantic"][i, j]), 2) if "semantic" in block else "",
+                    })
+
+    for matrix in matrices.values():
+        matrix.flush()
+
+    with open(os.path.join(args.out, "index.json"), "w", encoding="utf-8") as fh:
+        json.dump({
+            "resumes": [{"file": p, "error": e} for p, e in rows],
+            "jds": [os.path.basename(p) for p in jd_paths],
+            "jd_skills": jds.skill_totals.tolist(),
+        }, fh, indent=2)
+
+    failed = sum(1 for _, e in rows if e)
+    print(
+        f"Scored {len(rows) - failed} resumes x {len(jds)} JDs ({failed} failed) -> {args.out}",
+        file=sys.stderr
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+import argparse
+import asyncio
+import base64
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+
+import stage_metrics
+from resume_parser import IngestTimeout, ResumeParseError, _init_worker, _on_alarm, pool_context
+from stage_metrics import HISTOGRAM, PROFILERS, span
+
+# ================= HTTP SCORING SERVICE =================
+# python service.py --port 8000
+# POST /analyze         JSON {resume_text, jd_text, semantic, pdf}
+# POST /analyze/upload  multipart resume=<pdf|docx>, jd_text, semantic, pdf
+# GET  /metrics         Prometheus text, per-stage latency histograms
+# GET  /metrics/stages  p50 / p95 / p99 per stage (JSON)
+#
+# one process serves every request: parsing + scoring run in a process
+# pool, MiniLM encodes from concurrent requests are micro-batched onto
+# the single loaded model
+
+PARSE_WORKERS = int(os.environ.get("ATS_PARSE_WORKERS", os.cpu_count() or 2))
+PARSE_TIMEOUT = float(os.environ.get("ATS_PARSE_TIMEOUT", 30))
+WORKER_MEMORY_MB = int(os.environ.get("ATS_WORKER_MEMORY_MB", 1024))
+MAX_UPLOAD_BYTES = int(os.environ.get("ATS_MAX_UPLOAD_MB", 10)) * 1024 * 1024
+
+BATCH_WINDOW_MS = float(os.environ.get("ATS_BATCH_WINDOW_MS", 5))
+BATCH_MAX_TEXTS = int(os.environ.get("ATS_BATCH_MAX_TEXTS", 64))
+
+UPLOAD_EXTENSIONS = (".pdf", ".docx")
+
+# per-request profiling ("profile": "cprofile" | "pyinstrument") is opt-in
+ALLOW_PROFILING = bool(os.environ.get("ATS_ALLOW_PROFILING"))
+
+# ================= WORKER SIDE =================
+
+_worker_cache = None
+
+def _analyze_job(data, filename, resume_text, jd_text, want_pdf, timeout, profiler=None):
+    """
+    Runs in a pool process: extract / clean, analyze, optionally render
+    the PDF. Returns (cleaned resume, result dict, pdf bytes or None,
+    stage timings, profile report or None).
+    """
+    args = (data, filename, resume_text, jd_text, want_pdf, timeout)
+    with stage_metrics.capture(emit=False) as timings:
+        if profiler is None:
+            out, text = _analyze_steps(*args), None
+        else:
+            with stage_metrics.profile(profiler) as report:
+                out = _analyze_steps(*args)
+            text = report.text
+    return (*out, timings, text)
+
+def _analyze_steps(data, filename, resume_text, jd_text, want_pdf, timeout):
+    global _worker_cache
+    from ats_engine import analyze_cached, clean_resume_text
+    from text_cache import TextCache, cached_resume_text
+
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        if data is not None:
+            if _worker_cache is None:
+                _worker_cache = TextCache()
+            try:
+                _, resume = cached_resume_text(data, filename, _worker_cache)
+            except (IngestTimeout, MemoryError):
+                raise
+            except Exception as e:
+                raise ResumeParseError(f"{type(e).__name__}: {e}") from None
+        else:
+            resume = clean_resume_text(resume_text)
+
+        result = analyze_cached(resume, jd_text)
+
+        pdf = None
+        if want_pdf:
+            from resume_pdf import cached_optimized_resume_pdf
+            pdf = cached_optimized_resume_pdf(
+                result.details, result.matched, result.missing, resume, jd_text
+            )
+        return resume, result.to_dict(), pdf
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+# ================= ENCODE MICRO-BATCHING =================
+
+class EncodeBatcher:
+    """
+    Collects encode calls from concurrent requests for up to `window_ms`
+    (or `max_texts` texts) and runs them as one encode_texts() batch on a
+    single model thread.
+    """
+
+    def __init__(self, encode, window_ms=BATCH_WINDOW_MS, max_texts=BATCH_MAX_TEXTS):
+        self._encode = encode
+        self.window = window_ms / 1000
+        self.max_texts = max_texts
+        self._pending = []
+        self._size = 0
+        self._timer = None
+        self._model_thread = ThreadPoolExecutor(1, thread_name_prefix="encode")
+
+    async def encode(self, texts):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((list(texts), future))
+        self._size += len(texts)
+
+        if self._size >= self.max_texts:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._size = self._pending, [], 0
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch):
+        texts = [t for group, _ in batch for t in group]
+        try:
+            vectors = await asyncio.get_running_loop().run_in_executor(
+                self._model_thread, self._encode, texts
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for group, future in batch:
+            if not future.done():
+                future.set_result(vectors[start:start + len(group)])
+            start += len(group)
+
+    def close(self):
+        self._model_thread.shutdown(wait=False)
+
+# ================= APP =================
+
+class AnalyzeRequest(BaseModel):
+    resume_text: str
+    jd_text: str
+    semantic: bool = False
+    pdf: bool = False
+    profile: str = ""
+
+def _new_pool():
+    # also re-created after a crash, when this process has the model loaded
+    return ProcessPoolExecutor(
+        PARSE_WORKERS, mp_context=pool_context(),
+        initializer=_init_worker, initargs=(WORKER_MEMORY_MB,)
+    )
+
+@asynccontextmanager
+async def lifespan(app):
+    from ai_matcher import encode_texts
+
+    app.state.pool = _new_pool()
+    app.state.batcher = EncodeBatcher(encode_texts)
+    try:
+        yield
+    finally:
+        app.state.batcher.close()
+        app.state.pool.shutdown(wait=False, cancel_futures=True)
+
+app = FastAPI(title="AI Resume ATS Analyzer", lifespan=lifespan)
+
+async def _run_analysis(data, filename, resume_text, jd_text, semantic, want_pdf, profiler=""):
+    if not jd_text.strip():
+        raise HTTPException(422, "jd_text is empty")
+    if profiler and not ALLOW_PROFILING:
+        raise HTTPException(403, "profiling is disabled (set ATS_ALLOW_PROFILING)")
+    if profiler and profiler not in PROFILERS:
+        raise HTTPException(422, f"profile must be one of {', '.join(PROFILERS)}")
+
+    with span("request"):
+        return await _analysis_stages(
+            data, filename, resume_text, jd_text, semantic, want_pdf, profiler or None
+        )
+
+async def _analysis_stages(data, filename, resume_text, jd_text, semantic, want_pdf, profiler):
+    loop = asyncio.get_running_loop()
+    pool = app.state.pool
+    try:
+        with span("worker"):
+            resume, result, pdf, timings, report = await loop.run_in_executor(
+                pool, _analyze_job, data, filename, resume_text, jd_text, want_pdf,
+                PARSE_TIMEOUT, profiler
+            )
+    except IngestTimeout:
+        raise HTTPException(504, "resume parsing timed out")
+    except MemoryError:
+        raise HTTPException(413, "resume too large to parse")
+    except ResumeParseError as e:
+        raise HTTPException(422, f"could not read resume: {e}")
+    except BrokenProcessPool:
+        # a worker died (e.g. hard crash in a PDF library): replace the pool once
+        if app.state.pool is pool:
+            app.state.pool = _new_pool()
+            pool.shutdown(wait=False)
+        raise HTTPException(500, "resume parser crashed")
+    stage_metrics.replay(timings)
+
+    result["semantic_score"] = None
+    if semantic:
+        with span("semantic"):   # includes the batching wait
+            jd_vec, resume_vec = await app.state.batcher.encode([jd_text, resume])
+        result["semantic_score"] = round(float(resume_vec @ jd_vec) * 100, 2)
+
+    if want_pdf:
+        result["pdf_base64"] = base64.b64encode(pdf).decode("ascii") if pdf else None
+    if report is not None:
+        result["profile"] = report
+    return result
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(
+        HISTOGRAM.prometheus_text(), media_type="text/plain; version=0.0.4"
+    )
+
+@app.get("/metrics/stages")
+async def metrics_stages():
+    return HISTOGRAM.summary()
+
+@app.post("/analyze")
+async def analyze_text(req: AnalyzeRequest):
+    if not req.resume_text.strip():
+        raise HTTPException(422, "resume_text is empty")
+    return await _run_analysis(
+        None, None, req.resume_text, req.jd_text, req.semantic, req.pdf, req.profile
+    )
+
+@app.post("/analyze/upload")
+async def analyze_upload(
+    resume: UploadFile = File(...),
+    jd_text: str = Form(...),
+    semantic: bool = Form(False),
+    pdf: bool = Form(False),
+    profile: str = Form(""),
+):
+    filename = resume.filename or ""
+    if not filename.lower().endswith(UPLOAD_EXTENSIONS):
+        raise HTTPException(415, "resume must be a PDF or DOCX file")
+
+    data = await resume.read(MAX_UPLOAD_BYTES + 1)
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise HTTPException(413, "resume file too large")
+
+    return await _run_analysis(data, filename, None, jd_text, semantic, pdf, profile)
+
+# ================= CLI =================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ATS scoring HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    # a single server process: the model is loaded once and shared
+    uvicorn.run(app, host=args.host, port=args.port)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
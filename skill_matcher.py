@@ -0,0 +1,87 @@
+import re
+from collections import Counter
+
+# ================= MULTI-PATTERN SKILL MATCHER =================
+
+def trie_pattern(words, escape=re.escape):
+    """
+    Alternation factored into a prefix tree, so the scanner rejects
+    most positions on their first character and the cost of a scan
+    does not grow with the number of words.
+    """
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [escape(ch) + build(node[ch]) for ch in sorted(node) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+def _escape_skill_char(ch):
+    # "machine learning" also matches across line breaks / double spaces
+    return r"\s+" if ch == " " else re.escape(ch)
+
+# a skill is a whole token: "java" never inside "javascript", "c" never inside "c++"
+_LEFT = r"(?<![\w+#])"
+_RIGHT = r"(?![\w+#])"
+# one-letter skills (c, r) also refuse "R&D", "C-level", "C's"
+_LEFT_SHORT = r"(?<![\w+#&'-])"
+_RIGHT_SHORT = r"(?![\w+#&'-])"
+
+class SkillMatcher:
+    """
+    Finds every skill (and alias) occurrence in lowered text in one scan.
+    `aliases` maps alternate spellings to their canonical skill name.
+    """
+
+    def __init__(self, skills, aliases=None):
+        self.canonical = {s.lower(): s for s in skills}
+        for alias, skill in (aliases or {}).items():
+            self.canonical[alias.lower()] = skill
+
+        long_terms = [t for t in self.canonical if len(t) > 1]
+        short_terms = [t for t in self.canonical if len(t) == 1]
+
+        branches = []
+        if long_terms:
+            branches.append(
+                _LEFT + "(" + trie_pattern(long_terms, _escape_skill_char) + ")" + _RIGHT
+            )
+        if short_terms:
+            branches.append(
+                _LEFT_SHORT + "([" + "".join(re.escape(t) for t in short_terms) + "])" + _RIGHT_SHORT
+            )
+
+        self.pattern = re.compile("|".join(branches)) if branches else None
+
+    def _canonical_of(self, matched):
+        return self.canonical.get(matched) or self.canonical[" ".join(matched.split())]
+
+    def find(self, lower_text):
+        """
+        {skill: [(start, end), ...]} for lowered text.
+        """
+        hits = {}
+        if self.pattern is None:
+            return hits
+        for m in self.pattern.finditer(lower_text):
+            skill = self._canonical_of(m.group(m.lastindex))
+            hits.setdefault(skill, []).append(m.span())
+        return hits
+
+    def counts(self, lower_text):
+        return Counter({s: len(spans) for s, spans in self.find(lower_text).items()})
+
+    def find_doc(self, doc):
+        """
+        Same as find(doc.lower), computed once per TokenizedDoc.
+        """
+        return doc.memo(("skills", self), lambda: self.find(doc.lower))
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from skill_matcher import SkillMatcher
+
+# ================= SKILL TAXONOMY =================
+# single source of skills, synonyms, categories and learning roadmaps
+# (skill_taxonomy.json); edits are picked up without a restart
+
+TAXONOMY_PATH = os.environ.get(
+    "ATS_SKILL_TAXONOMY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+)
+RELOAD_CHECK_SECONDS = 1.0
+
+class SkillTaxonomy:
+    """
+    Indexed, read-only view of the taxonomy file.
+    """
+
+    def __init__(self, data):
+        self.version = data.get("version", 1)
+        # changes with any edit, so results derived from the taxonomy can key on it
+        self.digest = hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        self.skills = []            # canonical names, file order
+        self.category = {}          # skill -> category
+        self.aliases = {}           # synonym -> skill
+        self.roadmap = {}           # skill -> {"path", "time"}
+        self.by_category = {c: [] for c in data.get("categories", [])}
+
+        for entry in data["skills"]:
+            name = entry["name"].lower()
+            if name in self.category:
+                continue
+
+            category = entry.get("category", "Other")
+            self.skills.append(name)
+            self.category[name] = category
+            self.by_category.setdefault(category, []).append(name)
+
+            for syn in entry.get("synonyms", []):
+                self.aliases[syn.lower()] = name
+
+            if entry.get("roadmap"):
+                self.roadmap[name] = entry["roadmap"]
+
+        self.skill_set = frozenset(self.skills)
+        self.matcher = SkillMatcher(self.skills, self.aliases)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+_lock = threading.Lock()
+_state = {"path": None, "mtime": None, "checked": 0.0, "taxonomy": None}
+
+def get_taxonomy(path=None):
+    """
+    Current taxonomy, reloaded when the file's mtime changes (checked at
+    most once per RELOAD_CHECK_SECONDS). A broken edit keeps the last
+    good version in service.
+    """
+    path = path or TAXONOMY_PATH
+    now = time.monotonic()
+
+    current = _state["taxonomy"]
+    if (
+        current is not None
+        and _state["path"] == path
+        and now - _state["checked"] < RELOAD_CHECK_SECONDS
+    ):
+        return current
+
+    with _lock:
+        if _state["path"] == path and now - _state["checked"] < RELOAD_CHECK_SECONDS:
+            return _state["taxonomy"]
+
+        _state["checked"] = now
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError as e:
+            if current is None or _state["path"] != path:
+                raise
+            print("TAXONOMY ERROR:", e)
+            return current
+
+        if _state["path"] == path and mtime == _state["mtime"]:
+            return current
+
+        try:
+            taxonomy = SkillTaxonomy.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            if current is None or _state["path"] != path:
+                raise
+            print("TAXONOMY ERROR:", e)
+            return current
+
+        _state.update(path=path, mtime=mtime, taxonomy=taxonomy)
+        return taxonomy
@@ -0,0 +1,221 @@
+import functools
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+# ================= PER-STAGE LATENCY =================
+# with span("clean"): ...   /   @timed("skill_gap")
+# every finished span goes to the registered sinks; the in-process
+# histogram is always one of them
+
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+RECENT_SAMPLES = 2048   # per stage, for p50 / p95 / p99
+
+class StageHistogram:
+    """
+    Thread-safe cumulative histogram per stage plus a window of recent
+    samples for percentiles.
+    """
+
+    def __init__(self, buckets=BUCKETS, recent=RECENT_SAMPLES):
+        self.buckets = tuple(buckets)
+        self.recent = recent
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def __call__(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {
+                    "counts": [0] * (len(self.buckets) + 1),
+                    "sum": 0.0,
+                    "recent": deque(maxlen=self.recent),
+                }
+            entry["counts"][bisect_left(self.buckets, seconds)] += 1
+            entry["sum"] += seconds
+            entry["recent"].append(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def summary(self):
+        """
+        {stage: {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"}}
+        """
+        with self._lock:
+            stages = {
+                s: (sum(e["counts"]), e["sum"], sorted(e["recent"]))
+                for s, e in self._stages.items()
+            }
+
+        out = {}
+        for stage, (count, total, recent) in sorted(stages.items()):
+            def pct(q):
+                return round(recent[min(len(recent) - 1, int(q * len(recent)))] * 1000, 3)
+            out[stage] = {
+                "count": count,
+                "mean_ms": round(total / count * 1000, 3),
+                "p50_ms": pct(0.50),
+                "p95_ms": pct(0.95),
+                "p99_ms": pct(0.99),
+            }
+        return out
+
+    def prometheus_text(self, name="ats_stage_seconds"):
+        """
+        Prometheus text exposition (histogram type).
+        """
+        with self._lock:
+            stages = {s: (list(e["counts"]), e["sum"]) for s, e in self._stages.items()}
+
+        lines = [
+            f"# HELP {name} Latency of each analysis pipeline stage.",
+            f"# TYPE {name} histogram",
+        ]
+        for stage, (counts, total) in sorted(stages.items()):
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{label}",le="{le}"}} {running}')
+            lines.append(f'{name}_sum{{stage="{label}"}} {total!r}')
+            lines.append(f'{name}_count{{stage="{label}"}} {running}')
+        return "\n".join(lines) + "\n"
+
+HISTOGRAM = StageHistogram()
+
+_log = logging.getLogger("ats.timing")
+
+def log_sink(stage, seconds):
+    _log.info("%s %.3f ms", stage, seconds * 1000)
+
+_sinks = [HISTOGRAM]
+if os.environ.get("ATS_TIMING_LOG"):
+    _sinks.append(log_sink)
+
+def add_sink(sink):
+    """
+    sink(stage, seconds) is called for every finished span.
+    """
+    if sink not in _sinks:
+        _sinks.append(sink)
+
+def remove_sink(sink):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+_local = threading.local()
+
+def _emit(stage, seconds):
+    for sink in list(_sinks):
+        try:
+            sink(stage, seconds)
+        except Exception as e:
+            print("METRICS ERROR:", e)
+
+def observe(stage, seconds):
+    if not getattr(_local, "quiet", False):
+        _emit(stage, seconds)
+    for captured in getattr(_local, "captures", ()):
+        captured.append((stage, seconds))
+
+@contextmanager
+def span(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+def timed(stage):
+    """
+    Decorator form of span().
+    """
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(stage, time.perf_counter() - start)
+        return inner
+    return wrap
+
+@contextmanager
+def capture(emit=True):
+    """
+    Collects the (stage, seconds) spans finished in this thread, so a pool
+    worker can hand its timings back to the serving process (emit=False:
+    they are not also sent to this process's sinks).
+    """
+    captured = []
+    stack = getattr(_local, "captures", ())
+    quiet = getattr(_local, "quiet", False)
+    _local.captures = stack + (captured,)
+    _local.quiet = quiet or not emit
+    try:
+        yield captured
+    finally:
+        _local.captures = stack
+        _local.quiet = quiet
+
+def replay(samples):
+    """
+    Feeds spans captured in another process to this process's sinks.
+    """
+    for stage, seconds in samples:
+        _emit(stage, seconds)
+
+# ================= SINGLE-REQUEST PROFILING =================
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+class ProfileReport:
+    text = ""
+
+@contextmanager
+def profile(kind="cprofile", limit=40):
+    """
+    Profiles the enclosed block; the report text is set on exit.
+    """
+    report = ProfileReport()
+
+    if kind == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield report
+        finally:
+            profiler.stop()
+            report.text = profiler.output_text(unicode=True)
+        return
+
+    if kind != "cprofile":
+        raise ValueError(f"unknown profiler: {kind}")
+
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+        report.text = out.getvalue()
@@ -0,0 +1,291 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# ================= TALENT POOL REVERSE SEARCH =================
+# "which stored resumes already fit this new JD?"
+# python talent_pool.py add --resumes ./resumes
+# python talent_pool.py search --jd jd.txt -k 20
+
+DEFAULT_POOL_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "ats_analyzer", "talent_pool.sqlite3"
+)
+
+class CandidateIndex:
+    """
+    Exact (brute-force) cosine top-K over unit-length vectors.
+    Inserts/upserts are amortized O(1), deletes are O(1) swap-with-last.
+    """
+
+    def __init__(self, dim=None):
+        self.dim = dim
+        self.ids = []
+        self.rows = {}
+        self._vectors = np.zeros((0, dim or 0), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self.rows
+
+    def _reserve(self, extra):
+        needed = len(self.ids) + extra
+        if needed <= self._vectors.shape[0]:
+            return
+        capacity = max(needed, 2 * self._vectors.shape[0], 1024)
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:len(self.ids)] = self._vectors[:len(self.ids)]
+        self._vectors = grown
+
+    def add(self, ids, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(ids):
+            return
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+
+        self._reserve(len(ids))
+        for candidate_id, vector in zip(ids, vectors):
+            row = self.rows.get(candidate_id)
+            if row is None:
+                row = len(self.ids)
+                self.ids.append(candidate_id)
+                self.rows[candidate_id] = row
+            self._vectors[row] = vector
+
+    def remove(self, ids):
+        for candidate_id in ids:
+            row = self.rows.pop(candidate_id, None)
+            if row is None:
+                continue
+            last = len(self.ids) - 1
+            if row != last:
+                moved = self.ids[last]
+                self.ids[row] = moved
+                self.rows[moved] = row
+                self._vectors[row] = self._vectors[last]
+            self.ids.pop()
+
+    def search(self, query, k=10):
+        """
+        [(candidate_id, score 0–100)] best first.
+        """
+        n = len(self.ids)
+        if not n or k <= 0:
+            return []
+
+        scores = self._vectors[:n] @ np.asarray(query, dtype=np.float32)
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], round(float(scores[i]) * 100, 2)) for i in top]
+
+class TalentPool:
+    """
+    Persistent pool membership (SQLite: candidate id -> text digest, label)
+    over vectors kept in the embedding store, searched in memory.
+    """
+
+    def __init__(self, path=None):
+        from ai_matcher import get_embedding_store
+
+        self.path = path or DEFAULT_POOL_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.store = get_embedding_store()
+        self.index = CandidateIndex()
+        self.labels = {}
+        self.digests = {}     # candidate id -> digest of the indexed vector
+
+        with self._db() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS pool (
+                    candidate_id TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    added REAL NOT NULL
+                )
+            """)
+
+        self.refresh()
+
+    @contextmanager
+    def _db(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def refresh(self):
+        """
+        Syncs the in-memory index with inserts / updates / deletes made by
+        other processes. A candidate whose text changed gets the vector of
+        its new digest from the embedding store (the writer encoded it
+        there), or leaves the index if that vector is not available.
+        """
+        from ai_matcher import store_key
+
+        with self._db() as db:
+            members = {
+                cid: (digest, label)
+                for cid, digest, label in db.execute(
+                    "SELECT candidate_id, digest, label FROM pool"
+                )
+            }
+
+        gone = [cid for cid in self.digests if cid not in members]
+        self.index.remove(gone)
+        for cid in gone:
+            del self.digests[cid]
+
+        changed = [cid for cid in members if self.digests.get(cid) != members[cid][0]]
+        vectors = self.store.get_many(store_key(), [members[cid][0] for cid in changed])
+        found = [cid for cid in changed if members[cid][0] in vectors]
+        missing = [cid for cid in changed if members[cid][0] not in vectors]
+
+        self.index.remove(missing)
+        for cid in missing:
+            self.digests.pop(cid, None)
+        if found:
+            self.index.add(found, np.stack([vectors[members[cid][0]] for cid in found]))
+            self.digests.update((cid, members[cid][0]) for cid in found)
+
+        self.labels = {cid: label for cid, (_, label) in members.items()}
+
+    def add_texts(self, ids, texts, labels=None, batch_size=64):
+        """
+        Upserts candidates; only text not seen before is encoded.
+        """
+        from ai_matcher import clean_text, encode_texts
+        from embedding_store import text_digest
+
+        ids = list(ids)
+        texts = list(texts)
+        labels = list(labels) if labels is not None else ids
+        if not ids:
+            return
+
+        vectors = encode_texts(texts, batch_size=batch_size)
+        digests = [text_digest(clean_text(t)) for t in texts]
+
+        with self._db() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO pool VALUES (?, ?, ?, ?)",
+                [(c, d, l, time.time()) for c, d, l in zip(ids, digests, labels)]
+            )
+
+        self.index.add(ids, vectors)
+        self.labels.update(zip(ids, labels))
+        self.digests.update(zip(ids, digests))
+
+    def remove(self, ids):
+        ids = list(ids)
+        with self._db() as db:
+            db.executemany("DELETE FROM pool WHERE candidate_id = ?", [(c,) for c in ids])
+        self.index.remove(ids)
+        for c in ids:
+            self.labels.pop(c, None)
+            self.digests.pop(c, None)
+
+    def search_jd(self, jd_text, k=10):
+        """
+        [(candidate_id, label, score)] of the K closest stored resumes.
+        """
+        from ai_matcher import encode_texts
+
+        query = encode_texts([jd_text])[0]
+        return [
+            (cid, self.labels.get(cid, cid), score)
+            for cid, score in self.index.search(query, k)
+        ]
+
+# ================= CLI =================
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Talent pool reverse search.")
+    parser.add_argument("--pool", help="pool file (default: ~/.cache/ats_analyzer)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="add or update resumes in the pool")
+    add.add_argument("--resumes", help="directory of PDF / DOCX / TXT resumes")
+    add.add_argument("--manifest", help="file listing one resume path per line")
+    add.add_argument("--workers", type=int, help="extraction processes")
+    add.add_argument("--batch-size", type=int, default=64, help="resumes per encode batch")
+
+    remove = sub.add_parser("remove", help="remove candidates by id (file path)")
+    remove.add_argument("ids", nargs="+")
+
+    search = sub.add_parser("search", help="top-K stored resumes for a JD")
+    search.add_argument("--jd", required=True, help="job description text file")
+    search.add_argument("-k", type=int, default=20)
+
+    query = sub.add_parser("query", help='keyword search, e.g. python AND (django OR flask)')
+    query.add_argument("query")
+    query.add_argument("-n", type=int, default=20, help="matches to list")
+
+    return parser
+
+def keyword_index_for(pool):
+    """
+    The boolean / phrase keyword index kept next to the pool file.
+    """
+    from keyword_index import KeywordIndex
+
+    folder = os.path.dirname(os.path.abspath(pool.path))
+    return KeywordIndex(os.path.join(folder, "keyword_index.sqlite3"))
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    pool = TalentPool(args.pool)
+
+    if args.command == "add":
+        from batch_screen import collect_resume_paths, load_cleaned_resumes
+        from text_cache import TextCache
+
+        paths = collect_resume_paths(args.resumes, args.manifest)
+        ids, texts, failed = [], [], 0
+        for path, cleaned, err in load_cleaned_resumes(paths, TextCache(), args.workers):
+            if err:
+                failed += 1
+                print(f"skip {path}: {err}", file=sys.stderr)
+                continue
+            ids.append(os.path.abspath(path))
+            texts.append(cleaned)
+
+        labels = [os.path.basename(i) for i in ids]
+        pool.add_texts(ids, texts, labels=labels, batch_size=args.batch_size)
+        keyword_index_for(pool).add_texts(ids, texts, labels)
+        print(f"Pool now holds {len(pool.index)} resumes ({failed} failed)", file=sys.stderr)
+
+    elif args.command == "remove":
+        ids = [os.path.abspath(i) for i in args.ids]
+        pool.remove(ids)
+        keyword_index_for(pool).remove(ids)
+        print(f"Pool now holds {len(pool.index)} resumes", file=sys.stderr)
+
+    elif args.command == "query":
+        from keyword_index import print_search
+        return print_search(keyword_index_for(pool), args.query, args.n)
+
+    else:
+        with open(args.jd, encoding="utf-8") as fh:
+            jd = fh.read()
+        start = time.perf_counter()
+        hits = pool.search_jd(jd, args.k)
+        took = (time.perf_counter() - start) * 1000
+        for rank, (cid, label, score) in enumerate(hits, 1):
+            print(f"{rank:>3}. {score:6.2f}  {label}  ({cid})")
+        print(f"{len(hits)} of {len(pool.index)} in {took:.1f} ms", file=sys.stderr)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+import argparse
+import hashlib
+import math
+import os
+import struct
+import sys
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from doc_tokens import as_doc
+
+# ================= CORPUS TERM WEIGHTS (IDF / BM25) =================
+# python term_weights.py build --resumes ./resumes --jds ./jds --out idf_table.bin
+# python term_weights.py rank --table idf_table.bin --jd jd.txt --resumes ./resumes -k 20
+#
+# table file (little endian, memory-mapped):
+#   magic "ATSIDF01" | n_terms u64 | n_docs u64 | avg_doc_len f64 | unseen_idf f64
+#   offsets u64[n_terms + 1] | idf f32[n_terms] (padded to 8) | sorted utf-8 terms
+
+IDF_TABLE_PATH = os.environ.get(
+    "ATS_IDF_TABLE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "idf_table.bin")
+)
+MAGIC = b"ATSIDF01"
+HEADER = struct.Struct("<8sQQdd")
+
+K1 = 1.2
+B = 0.75
+
+def bm25_idf(df, n_docs):
+    # BM25+ style: never negative, so very common words still count a little
+    return math.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+
+class IdfTable:
+    """
+    Read-only, memory-mapped term -> IDF lookup.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, n_terms, n_docs, avg_len, unseen = HEADER.unpack(raw[:HEADER.size].tobytes())
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an IDF table")
+
+        self.n_docs = n_docs
+        self.avg_doc_len = avg_len or 1.0
+        self.unseen_idf = unseen
+
+        start = HEADER.size
+        self._offsets = raw[start:start + 8 * (n_terms + 1)].view(np.uint64)
+        start += 8 * (n_terms + 1)
+        self._idf = raw[start:start + 4 * n_terms].view(np.float32)
+        start += 4 * n_terms + (-4 * n_terms) % 8
+        self._terms = raw[start:]
+        self._index = None
+
+        with open(path, "rb") as fh:
+            self.digest = hashlib.sha256(fh.read()).hexdigest()
+
+    def _vocabulary(self):
+        if self._index is None:
+            blob = self._terms.tobytes()
+            offsets = self._offsets.tolist()
+            self._index = {
+                blob[offsets[i]:offsets[i + 1]].decode("utf-8"): i
+                for i in range(len(offsets) - 1)
+            }
+        return self._index
+
+    def __len__(self):
+        return len(self._idf)
+
+    def idf(self, term):
+        i = self._vocabulary().get(term)
+        return self.unseen_idf if i is None else float(self._idf[i])
+
+    def weights(self, doc):
+        """
+        {term: idf} over a document's unique tokens, computed once per doc.
+        """
+        doc = as_doc(doc)
+        return doc.memo(("idf", self.digest), lambda: {t: self.idf(t) for t in doc.word_set()})
+
+def build_idf_table(texts, path):
+    """
+    Document frequencies over the same tokens ats_score uses, written as
+    a table file. Returns the number of documents.
+    """
+    df = Counter()
+    n_docs = 0
+    total_len = 0
+    for text in texts:
+        doc = as_doc(text)
+        df.update(doc.word_set())
+        total_len += len(doc.words)
+        n_docs += 1
+
+    terms = sorted(df)
+    blobs = [t.encode("utf-8") for t in terms]
+    offsets = np.zeros(len(terms) + 1, dtype=np.uint64)
+    offsets[1:] = np.cumsum([len(b) for b in blobs], dtype=np.uint64)
+    idf = np.array([bm25_idf(df[t], n_docs) for t in terms], dtype=np.float32)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(HEADER.pack(
+            MAGIC, len(terms), n_docs,
+            total_len / max(1, n_docs), bm25_idf(0, n_docs)
+        ))
+        fh.write(offsets.astype("<u8").tobytes())
+        fh.write(idf.astype("<f4").tobytes())
+        fh.write(b"\0" * ((-4 * len(terms)) % 8))
+        fh.write(b"".join(blobs))
+    os.replace(tmp, path)
+    return n_docs
+
+@lru_cache(maxsize=4)
+def _load_table(path, mtime):
+    return IdfTable(path)
+
+def get_idf_table(path=None):
+    """
+    The table at `path` (default ATS_IDF_TABLE), reloaded when rebuilt.
+    """
+    path = path or IDF_TABLE_PATH
+    return _load_table(path, os.stat(path).st_mtime_ns)
+
+# ================= SCORING =================
+
+def weighted_match(resume, jd, table, mode="bm25"):
+    """
+    Share (0–1) of the JD's IDF mass found in the resume, in one pass over
+    the resume's token counts. "tfidf": a term counts fully once present;
+    "bm25": term frequency saturates, normalized by resume length, so one
+    mention at average length counts fully and more can make up (up to
+    the 1.0 cap) for terms that are missing.
+    """
+    resume, jd = as_doc(resume), as_doc(jd)
+    weights = table.weights(jd)
+    total = sum(weights.values())
+    if not total:
+        return 0.0
+
+    got = 0.0
+    if mode == "tfidf":
+        for term in resume.counts:
+            got += weights.get(term, 0.0)
+    elif mode == "bm25":
+        norm = K1 * (1 - B + B * len(resume.words) / table.avg_doc_len)
+        for term, tf in resume.counts.items():
+            w = weights.get(term)
+            if w:
+                got += w * tf * (K1 + 1) / (tf + norm)
+    else:
+        raise ValueError(f"unknown weighting: {mode}")
+    return min(1.0, got / total)
+
+class TermIndex:
+    """
+    In-memory inverted index (term -> doc rows, term frequencies) for
+    scoring a whole pool against a JD touching only the JD's terms.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.ids = []
+        self._lengths = []
+        self._postings = {}     # term -> ([rows], [tf])
+        self._frozen = {}       # term -> (rows array, tf array)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, doc_id, doc):
+        row = len(self.ids)
+        doc = as_doc(doc)
+        self.ids.append(doc_id)
+        self._lengths.append(len(doc.words))
+        for term, tf in doc.counts.items():
+            rows, tfs = self._postings.setdefault(term, ([], []))
+            rows.append(row)
+            tfs.append(tf)
+            self._frozen.pop(term, None)
+
+    def _posting(self, term):
+        found = self._frozen.get(term)
+        if found is None:
+            rows, tfs = self._postings[term]
+            found = (np.asarray(rows), np.asarray(tfs, dtype=np.float32))
+            self._frozen[term] = found
+        return found
+
+    def match_ratios(self, jd, mode="bm25"):
+        """
+        weighted_match() of every indexed doc against the JD.
+        """
+        acc = np.zeros(len(self.ids), dtype=np.float64)
+        weights = self.table.weights(jd)
+        total = sum(weights.values())
+        if not total or not self.ids:
+            return acc
+
+        norms = None
+        if mode == "bm25":
+            lengths = np.asarray(self._lengths, dtype=np.float64)
+            norms = K1 * (1 - B + B * lengths / self.table.avg_doc_len)
+        elif mode != "tfidf":
+            raise ValueError(f"unknown weighting: {mode}")
+
+        for term, w in weights.items():
+            if term not in self._postings:
+                continue
+            rows, tfs = self._posting(term)
+            if norms is None:
+                acc[rows] += w
+            else:
+                acc[rows] += w * tfs * (K1 + 1) / (tfs + norms[rows])
+        return np.minimum(1.0, acc / total)
+
+    def top(self, jd, k=10, mode="bm25"):
+        """
+        [(doc_id, ats-scale score)] best first.
+        """
+        ratios = self.match_ratios(jd, mode)
+        k = min(k, len(ratios))
+        if k <= 0:
+            return []
+        best = np.argpartition(-ratios, k - 1)[:k]
+        best = best[np.argsort(-ratios[best])]
+        return [(self.ids[i], round(min(98, 35 + float(ratios[i]) * 65))) for i in best]
+
+# ================= CLI =================
+
+def _read_texts(paths):
+    for path in paths:
+        with open(path, encoding="utf-8", errors="ignore") as fh:
+            yield fh.read()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Corpus IDF table for weighted ATS scoring.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="build the IDF table from resumes and JDs")
+    build.add_argument("--resumes", help="directory of PDF / DOCX / TXT resumes")
+    build.add_argument("--manifest", help="file listing one resume path per line")
+    build.add_argument("--jds", help="directory of JD .txt files")
+    build.add_argument("--workers", type=int, help="extraction processes")
+    build.add_argument("--out", default=IDF_TABLE_PATH)
+
+    rank = sub.add_parser("rank", help="rank a resume folder against a JD via the inverted index")
+    rank.add_argument("--jd", required=True)
+    rank.add_argument("--resumes", help="directory of PDF / DOCX / TXT resumes")
+    rank.add_argument("--manifest", help="file listing one resume path per line")
+    rank.add_argument("--table", default=IDF_TABLE_PATH)
+    rank.add_argument("--mode", choices=["tfidf", "bm25"], default="bm25")
+    rank.add_argument("--workers", type=int, help="extraction processes")
+    rank.add_argument("-k", type=int, default=20)
+
+    args = parser.parse_args(argv)
+
+    from batch_screen import collect_resume_paths, load_cleaned_resumes
+    from text_cache import TextCache
+
+    paths = collect_resume_paths(args.resumes, args.manifest)
+    resumes = (
+        (path, cleaned)
+        for path, cleaned, err in load_cleaned_resumes(paths, TextCache(), args.workers)
+        if not err
+    )
+
+    if args.command == "build":
+        jd_paths = []
+        if args.jds:
+            jd_paths = sorted(
+                os.path.join(args.jds, f) for f in os.listdir(args.jds) if f.endswith(".txt")
+            )
+
+        def texts():
+            for _, cleaned in resumes:
+                yield cleaned
+            yield from _read_texts(jd_paths)
+
+        n = build_idf_table(texts(), args.out)
+        table = IdfTable(args.out)
+        print(f"{len(table)} terms from {n} documents -> {args.out}", file=sys.stderr)
+        return 0
+
+    with open(args.jd, encoding="utf-8") as fh:
+        jd = fh.read()
+    index = TermIndex(get_idf_table(args.table))
+    for path, cleaned in resumes:
+        index.add(path, cleaned)
+    for rank_no, (path, score) in enumerate(index.top(jd, args.k, args.mode), 1):
+        print(f"{rank_no:>3}. {score:>3}  {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
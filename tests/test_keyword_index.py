@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+import keyword_index
+from keyword_index import KeywordIndex, parse_query
+
+@pytest.fixture
+def index(tmp_path):
+    return KeywordIndex(os.path.join(tmp_path, "index.sqlite3"))
+
+def found(index, query):
+    _, hits = index.search(query, 100)
+    return sorted(cid for cid, _ in hits)
+
+def test_boolean_query(index):
+    index.add_texts(["a", "b", "c"], [
+        "python django developer",
+        "python flask developer, intern",
+        "java spring developer",
+    ])
+    assert found(index, "python AND (django OR flask) AND NOT intern") == ["a"]
+    assert found(index, "NOT python") == ["c"]
+
+def test_phrase_needs_adjacent_words(index):
+    index.add_texts(["a", "b", "c"], [
+        "applied machine learning to fraud models",
+        "learning about every machine in the plant",
+        "machine\nlearning pipelines",
+    ])
+    assert found(index, '"machine learning"') == ["a", "c"]
+    assert found(index, "machine AND learning") == ["a", "b", "c"]
+
+def test_skill_terms_the_words_cannot_spell(index):
+    index.add_texts(["a", "b", "c"], [
+        "backend in c++ and c#",
+        "dashboards in r, apis in node.js",
+        "research and development (R&D) in c",
+    ])
+    assert found(index, "c++") == ["a"]
+    assert found(index, "c#") == ["a"]
+    assert found(index, "r") == ["b"]
+    assert found(index, "node.js") == ["b"]
+    with pytest.raises(ValueError):
+        parse_query("++")
+
+def test_tombstones_hide_removed_and_replaced_docs(index):
+    index.add_texts(["a", "b"], ["python developer", "python analyst"])
+    index.remove(["a"])
+    index.add_texts(["b"], ["java analyst"])
+
+    assert found(index, "python") == []
+    assert found(index, "java") == ["b"]
+    assert len(index) == 1
+    assert index.stats()["tombstones"] == 2
+
+    index.compact()
+    stats = index.stats()
+    assert stats["tombstones"] == 0
+    assert stats["segments"] == 1
+    assert found(index, "analyst") == ["b"]
+
+def test_segments_merge_and_keep_postings_sorted(index):
+    for i in range(keyword_index.MERGE_FACTOR):
+        words = "python sql" if i % 2 else "python java"
+        index.add_texts([f"c{i}"], [f"{words} developer number{'x' * i}"])
+
+    assert index.stats()["segments"] == 1
+    evens = [f"c{i}" for i in range(0, keyword_index.MERGE_FACTOR, 2)]
+    assert found(index, "java") == evens
+    assert found(index, "python") == sorted(f"c{i}" for i in range(keyword_index.MERGE_FACTOR))
+    assert found(index, '"python sql developer"') == sorted(
+        set(found(index, "python")) - set(evens)
+    )
+
+def test_single_doc_inserts_merge_each_doc_once_per_tier(index, monkeypatch):
+    merged = []
+    merge = KeywordIndex._merge
+
+    def counting(self, db, segment_ids):
+        marks = ",".join("?" * len(segment_ids))
+        merged.append(db.execute(
+            f"SELECT SUM(n_docs) FROM segments WHERE segment_id IN ({marks})", segment_ids
+        ).fetchone()[0])
+        merge(self, db, segment_ids)
+
+    monkeypatch.setattr(KeywordIndex, "_merge", counting)
+    # one large old segment, then many single-doc inserts after it
+    old = keyword_index.MERGE_FACTOR ** 3
+    index.add_texts([f"old{i}" for i in range(old)], ["python analyst"] * old)
+
+    n = keyword_index.MERGE_FACTOR ** 3
+    for i in range(n):
+        index.add_texts([f"c{i}"], [f"python developer number{i}"])
+
+    # a base-MERGE_FACTOR counter: each new doc is rewritten at most once per
+    # tier, and the old segment is never touched
+    assert sum(merged) <= 3 * n
+    assert index.stats()["segments"] <= 2
+    total, _ = index.search("python", 0)
+    assert total == old + n
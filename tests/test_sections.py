@@ -0,0 +1,46 @@
+from ats_engine import clean_resume_text, extract_experience_section, segment_sections
+
+GLUED = (
+    "Jane Doe\n"
+    "TECHNICAL SKILLS\n"
+    "Python, SQL WORK EXPERIENCE\n"
+    "Software Engineer | Acme Corp | 2020 - 2023\n"
+    "• Built REST APIs\n"
+    "EDUCATION\n"
+    "B.Tech, XYZ University 2019"
+)
+
+def test_header_line_any_case():
+    sections = segment_sections("Summary\nBackend developer\nskills:\npython")
+    assert set(sections) == {"SUMMARY", "SKILLS"}
+
+def test_header_glued_onto_previous_line():
+    text = clean_resume_text(GLUED)
+    assert "WORK EXPERIENCE" in segment_sections(text)
+
+    experience = extract_experience_section(text)
+    assert [e["title"] for e in experience] == ["Software Engineer | Acme Corp | 2020 - 2023"]
+
+def test_lowercase_header_words_in_a_sentence_are_not_headers():
+    sections = segment_sections("SUMMARY\nI enjoy hands-on work experience\nEDUCATION\nB.Tech")
+    assert list(sections) == ["SUMMARY", "EDUCATION"]
+
+def test_single_word_header_ending_a_line_is_not_a_section():
+    text = (
+        "EXPERIENCE\n"
+        "Google Cloud Platform TRAINING\n"
+        "Acme Corp 2021 - 2023\n"
+        "• Developed APIs\n"
+        "PROJECTS\n"
+        "Chat app"
+    )
+    assert list(segment_sections(text)) == ["EXPERIENCE", "PROJECTS"]
+    assert [e["title"] for e in extract_experience_section(text)] == [
+        "Google Cloud Platform TRAINING", "Acme Corp 2021 - 2023"
+    ]
+
+    text = "SUMMARY\nCompleted two AWS CERTIFICATIONS\nSKILLS\nPython"
+    assert list(segment_sections(text)) == ["SUMMARY", "SKILLS"]
+
+def test_glued_header_after_an_all_caps_title_is_not_a_section():
+    assert segment_sections("JOHN DOE WORK EXPERIENCE\nAcme") == {}
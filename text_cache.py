@@ -0,0 +1,139 @@
+import hashlib
+import io
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from ats_engine import CLEAN_VERSION, clean_resume_text
+
+# ================= EXTRACTED TEXT CACHE =================
+# key: sha256 of the uploaded bytes
+# raw text survives cleaning-rule changes; cleaned text is
+# recomputed when its CLEAN_VERSION stamp is stale
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "ATS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ats_analyzer")
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+class TextCache:
+    """
+    Size-bounded LRU store of (raw, cleaned) resume text in SQLite.
+    One connection per call, so it is safe across threads and processes.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        if path is None:
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_CACHE_DIR, "text_cache.sqlite3")
+        self.path = path
+        self.max_bytes = max_bytes
+
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS texts (
+                    digest TEXT PRIMARY KEY,
+                    raw TEXT NOT NULL,
+                    cleaned TEXT NOT NULL,
+                    clean_version INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS texts_lru ON texts (last_access)")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:   # commit / rollback
+                yield db
+        finally:
+            db.close()
+
+    def get(self, digest):
+        """
+        Returns (raw, cleaned) or None on a miss.
+        """
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT raw, cleaned, clean_version FROM texts WHERE digest = ?",
+                (digest,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            raw, cleaned, version = row
+
+            if version != CLEAN_VERSION:
+                cleaned = clean_resume_text(raw)
+                db.execute(
+                    "UPDATE texts SET cleaned = ?, clean_version = ?, size = ?, last_access = ? "
+                    "WHERE digest = ?",
+                    (cleaned, CLEAN_VERSION, _entry_size(raw, cleaned), time.time(), digest)
+                )
+            else:
+                db.execute(
+                    "UPDATE texts SET last_access = ? WHERE digest = ?",
+                    (time.time(), digest)
+                )
+
+        return raw, cleaned
+
+    def put(self, digest, raw, cleaned=None):
+        """
+        Stores raw text (cleaning it if needed) and returns the cleaned text.
+        """
+        if cleaned is None:
+            cleaned = clean_resume_text(raw)
+
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO texts VALUES (?, ?, ?, ?, ?, ?)",
+                (digest, raw, cleaned, CLEAN_VERSION, _entry_size(raw, cleaned), time.time())
+            )
+            self._evict(db)
+
+        return cleaned
+
+    def _evict(self, db):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM texts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for digest, size in db.execute(
+            "SELECT digest, size FROM texts ORDER BY last_access"
+        ).fetchall():
+            db.execute("DELETE FROM texts WHERE digest = ?", (digest,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+def _entry_size(raw, cleaned):
+    return len(raw.encode("utf-8")) + len(cleaned.encode("utf-8"))
+
+def cached_resume_text(data, filename, cache):
+    """
+    (raw, cleaned) text for uploaded resume bytes, extracting only on a miss.
+    """
+    digest = file_digest(data)
+
+    hit = cache.get(digest)
+    if hit is not None:
+        return hit
+
+    from resume_parser import extract_text_from_pdf, extract_text_from_docx
+
+    if filename.lower().endswith(".pdf"):
+        raw = extract_text_from_pdf(io.BytesIO(data))
+    else:
+        raw = extract_text_from_docx(io.BytesIO(data))
+
+    return raw, cache.put(digest, raw)